@@ -0,0 +1,262 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gNMI_Benchmark.py                                                         #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    End-to-end throughput and latency benchmark of gNMI_Subscribe against   #
+#    an in-process gNMI_Target, one run per output mode                      #
+#                                                                            #
+#  Features supported:                                                       #
+#                                                                            #
+#    - messages/sec and updates/sec                                          #
+#    - p50/p99 per-message handling latency                                  #
+#    - RSS growth per million updates                                        #
+#    - machine-readable JSON results                                         #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI Subscribe benchmark in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gNMI_Benchmark"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import argparse
+import json
+import sys
+import os
+import time
+import grpc_support
+import gNMI_Subscribe
+import gNMI_Target
+import pygnmi
+
+##############################################################################
+
+# output mode name to the pygnmi options selecting it
+MODES = {
+    'raw':      [],
+    'xpath':    ['--output', 'xpath'],
+    'jsonl':    ['--output', 'jsonl'],
+    'logstash': ['--logstash'],
+    'none':     ['--output', 'none'],
+    'stats':    ['--stats'],
+}
+
+
+def rss():
+    # resident set size in bytes
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered)-1, int(len(ordered)*p/100.0))]
+
+
+class TimedResponses(object):
+    # Wraps the Subscribe response iterator. The time between handing out a
+    # response and the request for the next one is the time subscribe()
+    # spent handling it.
+
+    def __init__(self, responses, result):
+        self.responses = responses
+        self.result = result
+        self.handed = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.handed is not None:
+            self.result.latency.append(time.time() - self.handed)
+            self.handed = None
+        response = next(self.responses)
+        # sync_response and error messages carry no telemetry
+        if response.HasField('update'):
+            self.result.msgs += 1
+            self.result.upds += len(response.update.update)
+        self.handed = time.time()
+        return response
+
+    next = __next__
+
+    def __getattr__(self, name):
+        return getattr(self.responses, name)
+
+
+class TimedChannel(object):
+    # channel proxy timing the Subscribe stream, other RPCs pass through
+
+    def __init__(self, channel, result):
+        self.channel = channel
+        self.result = result
+
+    def stream_stream(self, method, *args, **kwargs):
+        multicallable = self.channel.stream_stream(method, *args, **kwargs)
+        result = self.result
+        return lambda *a, **kw: TimedResponses(multicallable(*a, **kw), result)
+
+    def __getattr__(self, name):
+        return getattr(self.channel, name)
+
+
+class Result(object):
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.msgs = 0
+        self.upds = 0
+        self.latency = []
+
+    def report(self, secs, rss_growth):
+        ordered = sorted(self.latency)
+        return {
+            'mode': self.mode,
+            'seconds': round(secs, 3),
+            'messages': self.msgs,
+            'updates': self.upds,
+            'msgs_per_sec': round(self.msgs/secs, 1) if secs else 0.0,
+            'upds_per_sec': round(self.upds/secs, 1) if secs else 0.0,
+            'latency_p50_us': round(percentile(ordered, 50)*1000000, 1),
+            'latency_p99_us': round(percentile(ordered, 99)*1000000, 1),
+            'rss_growth_bytes': rss_growth,
+            'rss_per_million_upds': int(rss_growth*1000000.0/self.upds) if self.upds else 0,
+        }
+
+
+def run(mode, port, options, log):
+    argv = ['--server', '127.0.0.1:%d' % port, '--timeout', str(options.duration), '--service', 'subscribe']
+    argv += ['--logfile', os.devnull] + MODES[mode] + options.xpaths
+    (client, prog) = pygnmi.get_options(argv)
+    clientlog = grpc_support.setup_log(client, prog+'-'+mode)
+
+    result = Result(mode)
+    channel = TimedChannel(grpc_support.create_channel(client, clientlog), result)
+
+    before = rss()
+    start = time.time()
+    gNMI_Subscribe.subscribe(channel, client, clientlog, prog)
+    secs = time.time() - start
+    report = result.report(secs, rss() - before)
+    log.info("%-8s %8.0f msg/sec %9.0f upd/sec  p50 %7.1fus  p99 %7.1fus  rss %+d bytes/M upds",
+             mode, report['msgs_per_sec'], report['upds_per_sec'], report['latency_p50_us'],
+             report['latency_p99_us'], report['rss_per_million_upds'])
+    return report
+
+
+def benchmark(options, log):
+    try:
+        import grpc
+        from google.protobuf.internal import api_implementation
+    except ImportError as err:
+        log.error(str(err))
+        quit()
+
+    targetargs = ['--listen', '127.0.0.1:0', '--paths', str(options.paths), '--batch', str(options.batch), '--sample', str(options.sample)]
+    if options.value:
+        targetargs += ['--value', options.value]
+    if options.use_prefix:
+        targetargs += ['--use_prefix']
+    (targetopts, prog) = gNMI_Target.get_options(targetargs)
+    targetopts.logfile = options.logfile
+    targetopts.quiet = True
+    (server, port) = gNMI_Target.start(targetopts, grpc_support.setup_log(targetopts, 'gNMI_Target'))
+
+    results = {
+        'version': __version__,
+        'python': sys.version.split()[0],
+        'grpcio': grpc.__version__,
+        'protobuf': api_implementation.Type(),
+        'timestamp': int(time.time()),
+        'target': {'paths': options.paths, 'batch': options.batch, 'sample_ms': options.sample, 'value': options.value, 'use_prefix': options.use_prefix},
+        'duration': options.duration,
+        'results': {},
+    }
+    try:
+        for mode in options.modes.split(','):
+            results['results'][mode] = run(mode, port, options, log)
+    finally:
+        server.stop(0)
+    return results
+
+##############################################################################
+
+def get_options(argv=None):
+    prog = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--version', action='version', version=prog+' '+__version__)
+
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-q', '--quiet',   action='store_true', help='disable logging')
+    group.add_argument('-v', '--verbose', action='count', help='enhanced logging')
+    group = parser.add_argument_group()
+    group.add_argument('--logfile', metavar='<filename>', type=argparse.FileType('wb', 0), default='-', help='Specify the logfile (default: <stdout>)')
+    group.add_argument('--json', metavar='<filename>', help='write results as JSON (default: <stdout>)')
+    group.add_argument('--modes', default=','.join(sorted(MODES)), help='comma separated output modes (default: all)')
+    group.add_argument('--duration', default=10, type=int, help='seconds per mode (default: 10)')
+
+    group = parser.add_argument_group()
+    group.add_argument('--paths', default=10000, type=int, help='leaves in the target tree (default: 10000)')
+    group.add_argument('--batch', default=100, type=int, help='updates per notification (default: 100)')
+    group.add_argument('--sample', default=1, type=int, help='target SAMPLE interval in milliseconds, small values saturate the client (default: 1)')
+    group.add_argument('--value', help='TypedValue kind sent by the target (default: json)')
+    group.add_argument('--use_prefix', action='store_true', help='target sends container prefixes')
+    group.add_argument('xpaths', nargs=argparse.REMAINDER, help='path(s) to subscribe (default: /)')
+    options = parser.parse_args(argv)
+
+    if len(options.xpaths)==0:
+        options.xpaths=['/']
+
+    for mode in options.modes.split(','):
+        if mode not in MODES:
+            parser.error('unknown mode '+mode)
+
+    return(options,prog)
+
+
+if __name__ == '__main__':
+    (options,prog) = get_options()
+
+    log = grpc_support.setup_log(options,prog)
+
+    results = benchmark(options, log)
+
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+# EOF
@@ -0,0 +1,365 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gNMI_Collect.py                                                           #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Concurrent gNMI Subscribe to many targets from a single process,        #
+#    using one asyncio event loop and one grpc.aio channel per target.       #
+#    Requires Python 3.7+ and a grpcio release providing grpc.aio.           #
+#                                                                            #
+#    With --workers the targets are spread over worker processes, each one   #
+#    running its own event loop. Counters are kept in shared memory, the     #
+#    parent reports them and restarts crashed workers (requires fork).       #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI multi-target Subscribe collector in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gNMI_Collect"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import os
+import time
+import grpc_support
+import gNMI_Subscribe
+
+##############################################################################
+
+class TargetStats(object):
+    def __init__(self, server):
+        self.server = server
+        self.msgs = 0
+        self.upds = 0
+        self.syncs = 0
+        self.errors = 0
+        self.connected = False
+        self.last_upds = 0
+        self.last_time = time.time()
+
+    def rate(self, now):
+        # update rate since the previous call, resets the reference point
+        secs = now - self.last_time
+        upds = self.upds - self.last_upds
+        self.last_upds = self.upds
+        self.last_time = now
+        if secs > 0:
+            return upds/secs
+        return 0.0
+
+
+class SharedStats(TargetStats):
+    # TargetStats keeping its counters in a shared multiprocessing.Array,
+    # written by the worker serving the target and read by the parent
+
+    FIELDS = ('msgs', 'upds', 'syncs', 'errors', 'connected')
+
+    def __init__(self, server, counters, index):
+        # the shared counters survive a worker restart, they are not reset
+        self.server = server
+        self.counters = counters
+        self.slot = index*len(self.FIELDS)
+        self.last_upds = self.upds
+        self.last_time = time.time()
+
+def _shared(field):
+    offset = SharedStats.FIELDS.index(field)
+    def getter(self):
+        return self.counters[self.slot+offset]
+    def setter(self, value):
+        self.counters[self.slot+offset] = value
+    return property(getter, setter)
+
+for field in SharedStats.FIELDS:
+    setattr(SharedStats, field, _shared(field))
+
+
+def read_targets(filename):
+    # one server/port per line, blank lines and '#' comments are ignored
+    targets = []
+    with open(filename) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                targets.append(line)
+    return targets
+
+
+async def collect_target(stats, options, log, deadline=None):
+    # deadline: end of the run (epoch seconds) for --timeout, shared by
+    # restarted workers
+    import grpc
+    import gnmi_pb2
+
+    channel = grpc_support.create_channel(options, log, server=stats.server, aio=True)
+    stub = gnmi_pb2.gNMIStub(channel)
+    metadata = [('username',options.username), ('password', options.password)]
+
+    aliases = grpc_support.AliasTable()
+    for (alias, path) in gNMI_Subscribe.client_aliases(options):
+        aliases.define(alias, path)
+
+    if deadline is None:
+        timeout = None
+    else:
+        timeout = max(deadline - time.time(), 0)
+
+    try:
+        responses = stub.Subscribe(gNMI_Subscribe.gen_request( options, log ), timeout=timeout, metadata=metadata)
+        stats.connected = True
+        async for response in responses:
+            if response.HasField('update'):
+                if aliases.learn(response.update):
+                    continue
+                aliases.resolve(response.update)
+                stats.msgs += 1
+                stats.upds += len(response.update.update)
+                if not options.stats:
+                    if options.output == "xpath":
+                        log.info('%s %s', stats.server, grpc_support.xpath_output(response.update))
+                    else:
+                        log.info('Update received from %s\n%s', stats.server, response)
+            elif response.HasField('sync_response'):
+                stats.syncs += 1
+                log.debug('Sync Response received from %s', stats.server)
+            elif response.HasField('error'):
+                stats.errors += 1
+                log.error('gNMI Error %d received from %s\n%s', response.error.code, stats.server, response.error.message)
+            else:
+                log.error('Unknown response received from %s:\n%s', stats.server, response)
+
+    except grpc.RpcError as x:
+        stats.errors += 1
+        log.error("grpc.RpcError received from %s:\n%s", stats.server, x.details())
+
+    except Exception as err:
+        stats.errors += 1
+        log.error("%s: %s", stats.server, err)
+
+    finally:
+        stats.connected = False
+        await channel.close()
+
+
+async def report(targets, options, log):
+    import asyncio
+
+    while True:
+        await asyncio.sleep(options.report)
+        now = time.time()
+        total = 0.0
+        for stats in targets:
+            rate = stats.rate(now)
+            total += rate
+            if options.stats:
+                log.info("%s: %d updates, %d messages, %5.0f upd/sec", stats.server, stats.upds, stats.msgs, rate)
+        connected = sum(1 for stats in targets if stats.connected)
+        log.info("Statistics: %d/%d targets connected, %5.0f upd/sec aggregate", connected, len(targets), total)
+
+
+async def collect_all(targets, options, log, reporting=True, deadline=None):
+    import asyncio
+
+    if reporting:
+        reporter = asyncio.ensure_future(report(targets, options, log))
+    try:
+        await asyncio.gather(*[collect_target(stats, options, log, deadline) for stats in targets])
+    finally:
+        if reporting:
+            reporter.cancel()
+
+
+def worker(index, servers, first, counters, options, log, deadline):
+    # worker process serving <servers>, shared counter slots from <first>
+    import asyncio
+
+    targets = [SharedStats(server, counters, first+i) for (i, server) in enumerate(servers)]
+    log.info("Worker %d (pid %d) subscribing to %d targets", index, os.getpid(), len(targets))
+    try:
+        asyncio.run(collect_all(targets, options, log, reporting=False, deadline=deadline))
+    except KeyboardInterrupt:
+        pass
+
+
+class Worker(object):
+    # a shard of the targets and the process serving it
+
+    def __init__(self, index, servers, first):
+        self.index = index
+        self.servers = servers
+        self.first = first
+        self.process = None
+        self.restarts = 0
+        # consecutive early deaths, for the restart backoff
+        self.attempt = 0
+        self.started = None
+        # restart time while waiting for the backoff
+        self.due = None
+        # not restarted, the --timeout is reached
+        self.abandoned = False
+
+    def finished(self):
+        # a worker ending normally (subscription timeout) is done
+        return self.abandoned or self.process.exitcode == 0
+
+    def start(self, context, counters, options, log, deadline):
+        self.started = time.time()
+        self.due = None
+        self.process = context.Process(target=worker, name='worker-%d' % self.index,
+                                       args=(self.index, self.servers, self.first, counters, options, log, deadline))
+        self.process.daemon = True
+        self.process.start()
+
+
+def collect_sharded(servers, options, log, prog):
+    import multiprocessing
+
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError as err:
+        log.error(str(err))
+        quit()
+
+    # one slot of SharedStats.FIELDS per target, each written by one worker
+    counters = context.Array('q', len(servers)*len(SharedStats.FIELDS), lock=False)
+    targets = [SharedStats(server, counters, i) for (i, server) in enumerate(servers)]
+
+    # contiguous shards, so a worker owns a single range of slots
+    count = min(options.workers, len(servers))
+    workers = []
+    first = 0
+    for index in range(count):
+        size = len(servers)//count + (index < len(servers) % count)
+        workers.append(Worker(index, servers[first:first+size], first))
+        first += size
+    log.info("Subscribing to %d targets with %d worker processes", len(servers), count)
+
+    # --timeout bounds the whole run, restarted workers get the time left
+    start = time.time()
+    if options.timeout:
+        deadline = start + options.timeout
+    else:
+        deadline = None
+
+    for w in workers:
+        w.start(context, counters, options, log, deadline)
+
+    due = start + options.report
+    try:
+        # runs until every worker has ended normally, dead workers are
+        # restarted after the --backoff/--backoff_max resubscribe backoff
+        while not all(w.finished() for w in workers):
+            time.sleep(0.5)
+            now = time.time()
+            for w in workers:
+                if w.process.is_alive() or w.finished():
+                    continue
+                if w.due is None:
+                    # a worker that ran longer than the maximum backoff
+                    # starts over with the initial one
+                    if now - w.started > options.backoff_max:
+                        w.attempt = 0
+                    delay = gNMI_Subscribe.backoff(w.attempt, options)
+                    if deadline is not None and now + delay >= deadline:
+                        w.abandoned = True
+                        log.error("Worker %d (pid %d) died with exit code %d, not restarted past the timeout",
+                                  w.index, w.process.pid, w.process.exitcode)
+                        for stats in targets[w.first:w.first+len(w.servers)]:
+                            stats.connected = 0
+                        continue
+                    w.attempt += 1
+                    w.restarts += 1
+                    w.due = now + delay
+                    log.error("Worker %d (pid %d) died with exit code %d, restarting in %1.2f seconds (restart %d)",
+                              w.index, w.process.pid, w.process.exitcode, delay, w.restarts)
+                    for stats in targets[w.first:w.first+len(w.servers)]:
+                        stats.connected = 0
+                elif now >= w.due:
+                    w.start(context, counters, options, log, deadline)
+            if now >= due:
+                due = now + options.report
+                rates = [stats.rate(now) for stats in targets]
+                for w in workers:
+                    shard = slice(w.first, w.first+len(w.servers))
+                    connected = sum(1 for stats in targets[shard] if stats.connected)
+                    if options.stats:
+                        log.info("Worker %d: %d/%d targets connected, %5.0f upd/sec, %d restarts",
+                                 w.index, connected, len(w.servers), sum(rates[shard]), w.restarts)
+                connected = sum(1 for stats in targets if stats.connected)
+                log.info("Statistics: %d/%d targets connected, %5.0f upd/sec aggregate", connected, len(targets), sum(rates))
+
+    except KeyboardInterrupt:
+        log.info("%s stopped by user", prog)
+        for w in workers:
+            w.process.join(5)
+            if w.process.is_alive():
+                w.process.terminate()
+
+    return targets, time.time() - start
+
+
+def collect(options, log, prog):
+    try:
+        import asyncio
+        import grpc.aio
+    except ImportError as err:
+        log.error(str(err))
+        quit()
+
+    if options.targets:
+        servers = read_targets(options.targets)
+    else:
+        servers = [options.server]
+
+    if options.workers > 1:
+        (targets, secs) = collect_sharded(servers, options, log, prog)
+    else:
+        targets = [TargetStats(server) for server in servers]
+        log.info("Subscribing to %d targets", len(targets))
+
+        start = time.time()
+        if options.timeout:
+            deadline = start + options.timeout
+        else:
+            deadline = None
+        try:
+            asyncio.run(collect_all(targets, options, log, deadline=deadline))
+
+        except KeyboardInterrupt:
+            log.info("%s stopped by user", prog)
+
+        secs = time.time() - start
+    msgs = sum(stats.msgs for stats in targets)
+    upds = sum(stats.upds for stats in targets)
+    for stats in targets:
+        log.info("%s: %d updates and %d messages, %d errors", stats.server, stats.upds, stats.msgs, stats.errors)
+    if secs > 0:
+        log.info("%d updates and %d messages from %d targets within %1.2f seconds (%5.0f upd/sec)", upds, msgs, len(targets), secs, upds/secs)
+
+    return msgs
+
+# EOF
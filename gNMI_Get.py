@@ -44,17 +44,19 @@ import os
 import time
 import grpc_support
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
 ##############################################################################
 
 def gen_request( opt, log ):
     import gnmi_pb2
-    mypaths = []
-    for path in opt.xpaths:
-        mypath = grpc_support.path_from_string(path)
-        mypaths.append(mypath)
+    mypaths = grpc_support.paths_from_strings(opt.xpaths)
 
     if opt.prefix:
-        myprefix = path_from_string(opt.prefix)
+        myprefix = grpc_support.path_from_string(opt.prefix)
     else:
         myprefix = None
 
@@ -63,8 +65,62 @@ def gen_request( opt, log ):
     else:
         myqos = None
 
-    return gnmi_pb2.GetRequest(path=mypaths)
-   
+    # one GetRequest per chunk of paths, all paths in one when chunk is 0
+    chunk = opt.chunk or len(mypaths) or 1
+    myrequests = []
+    for i in range(0, max(len(mypaths), 1), chunk):
+        myrequests.append(gnmi_pb2.GetRequest(prefix=myprefix, path=mypaths[i:i+chunk]))
+    return myrequests
+
+
+def get_parallel(stub, requests, options, metadata, log):
+    # Issues the GetRequests over the shared channel, at most
+    # options.parallel in flight, and merges the notifications in request
+    # order into one GetResponse.
+    import gnmi_pb2
+
+    done = queue.Queue()
+    futures = [None]*len(requests)
+    responses = [None]*len(requests)
+    issued = 0
+    inflight = 0
+
+    try:
+        while issued < len(requests) or inflight:
+            while issued < len(requests) and inflight < options.parallel:
+                futures[issued] = stub.Get.future(requests[issued], options.timeout, metadata=metadata)
+                futures[issued].add_done_callback(lambda f, i=issued: done.put(i))
+                issued += 1
+                inflight += 1
+            i = done.get()
+            inflight -= 1
+            responses[i] = futures[i].result()
+            log.debug("GetResponse %d/%d received", i+1, len(requests))
+    except:
+        for f in futures:
+            if f is not None:
+                f.cancel()
+        raise
+
+    response = gnmi_pb2.GetResponse()
+    for r in responses:
+        response.notification.extend(r.notification)
+    return response
+
+
+def json_output(response):
+    # {xpath: value} of a GetResponse, JSON payloads decoded
+    import gnmi_json
+    values = {}
+    for n in response.notification:
+        if n.prefix.elem:
+            prefix = grpc_support.string_from_path(n.prefix)
+        else:
+            prefix = ""
+        for u in n.update:
+            values[prefix+grpc_support.string_from_path(u.path)] = gnmi_json.value(u.val)
+    return values
+
 
 def get(channel, options, log, prog):
     try:
@@ -77,7 +133,7 @@ def get(channel, options, log, prog):
     log.debug("Create gNMI stub")
     stub = gnmi_pb2.gNMIStub(channel)
 
-    req_iterator = gen_request( options, log )
+    requests = gen_request( options, log )
     metadata = [('username',options.username), ('password', options.password)]
 
     msgs = 0
@@ -87,7 +143,11 @@ def get(channel, options, log, prog):
 
     try:
         response = gnmi_pb2.GetResponse()
-        response = stub.Get(req_iterator, options.timeout, metadata=metadata)
+        if len(requests) == 1:
+            response = stub.Get(requests[0], options.timeout, metadata=metadata)
+        else:
+            log.info("Sending %d GetRequests, %d in parallel", len(requests), options.parallel)
+            response = get_parallel(stub, requests, options, metadata, log)
 
 #        if response.HasField('notification'):
 #            log.debug('Sync Response received\n'+str(response))
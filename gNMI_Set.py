@@ -0,0 +1,228 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gNMI_Set.py                                                               #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    gNMI Set (GRPC Network Management Interface) in Python                  #
+#                                                                            #
+#  Features supported:                                                       #
+#                                                                            #
+#    - delete/replace/update operations read from a file                     #
+#    - operations packed into size-bounded SetRequests with shared prefix    #
+#    - SetRequests pipelined to many targets with bounded parallelism        #
+#                                                                            #
+#  Operations file:                                                          #
+#                                                                            #
+#    one operation per line, '#' starts a comment                            #
+#      delete  <xpath>                                                       #
+#      replace <xpath> <json value>                                          #
+#      update  <xpath> <json value>                                          #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI Set in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gNMI_Set"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import time
+import grpc_support
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+##############################################################################
+
+OPERATIONS = ('delete', 'replace', 'update')
+
+def read_operations(filename, opt):
+    # [(operation, Path, TypedValue or None)] in file order
+    import gnmi_pb2
+    operations = []
+    with open(filename) as f:
+        for (n, line) in enumerate(f):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split(None, 2)
+            op = fields[0].lower()
+            if op not in OPERATIONS or len(fields) < 2:
+                raise ValueError("%s:%d: expected '<delete|replace|update> <xpath> [<json value>]'" % (filename, n+1))
+            path = grpc_support.path_from_string(fields[1])
+            if op == 'delete':
+                operations.append((op, path, None))
+                continue
+            if len(fields) < 3:
+                raise ValueError("%s:%d: %s requires a value" % (filename, n+1, op))
+            value = fields[2].encode('utf-8')
+            if opt.encoding == 4:
+                val = gnmi_pb2.TypedValue(json_ietf_val=value)
+            else:
+                val = gnmi_pb2.TypedValue(json_val=value)
+            operations.append((op, path, val))
+    return operations
+
+
+def gen_request( opt, log ):
+    # Packs the operations into SetRequests sharing the --prefix, each one
+    # serialized at most --set_size bytes. The target applies the deletes,
+    # replaces and then updates of a request, so an operation ranking before
+    # one already in the request starts a new one to keep file order.
+    import gnmi_pb2
+
+    if opt.prefix:
+        myprefix = grpc_support.path_from_string(opt.prefix)
+    else:
+        myprefix = None
+
+    myrequests = []
+    request = gnmi_pb2.SetRequest(prefix=myprefix)
+    base = request.ByteSize()
+    size = base
+    rank = 0
+    for (op, path, val) in read_operations(opt.setfile, opt):
+        if op == 'delete':
+            item = path
+        else:
+            item = gnmi_pb2.Update(path=path, val=val)
+        # field key and length prefix take at most 6 bytes
+        itemsize = item.ByteSize() + 6
+        if size > base and (size + itemsize > opt.set_size or OPERATIONS.index(op) < rank):
+            myrequests.append(request)
+            request = gnmi_pb2.SetRequest(prefix=myprefix)
+            size = base
+        getattr(request, op).add().CopyFrom(item)
+        size += itemsize
+        rank = OPERATIONS.index(op)
+    if size > base:
+        myrequests.append(request)
+
+    log.info("%d operations packed into %d SetRequests", sum(len(r.delete)+len(r.replace)+len(r.update) for r in myrequests), len(myrequests))
+    return myrequests
+
+
+class TargetSet(object):
+    # the SetRequests of one target, sent one after the other
+
+    def __init__(self, server, stub):
+        self.server = server
+        self.stub = stub
+        self.next = 0
+        self.future = None
+        self.sent = 0
+        self.results = {}
+        self.rtts = []
+        self.start = None
+        self.secs = 0
+        self.error = None
+
+
+def set_paths(channel, options, log, prog):
+    try:
+        import grpc
+        import gnmi_pb2
+    except ImportError as err:
+        log.error(str(err))
+        quit()
+
+    requests = gen_request( options, log )
+    if not requests:
+        log.error("No set operations in %s", options.setfile)
+        return
+    metadata = [('username',options.username), ('password', options.password)]
+
+    if options.targets:
+        import gNMI_Collect
+        servers = gNMI_Collect.read_targets(options.targets)
+    else:
+        servers = [options.server]
+
+    targets = []
+    for server in servers:
+        if server == options.server:
+            stub = gnmi_pb2.gNMIStub(channel)
+        else:
+            stub = gnmi_pb2.gNMIStub(grpc_support.channels.get(options, log, server=server))
+        targets.append(TargetSet(server, stub))
+
+    # Requests of one target go out in order, one at a time; up to
+    # --parallel targets have a request in flight.
+    done = queue.Queue()
+    waiting = list(reversed(targets))
+    inflight = 0
+
+    def issue(target):
+        target.sent = time.time()
+        if target.start is None:
+            target.start = target.sent
+        target.future = target.stub.Set.future(requests[target.next], options.timeout, metadata=metadata)
+        target.future.add_done_callback(lambda f: done.put(target))
+
+    try:
+        while waiting or inflight:
+            while waiting and inflight < options.parallel:
+                issue(waiting.pop())
+                inflight += 1
+            target = done.get()
+            target.rtts.append(time.time() - target.sent)
+            try:
+                response = target.future.result()
+            except grpc.RpcError as x:
+                target.error = x.details()
+                log.error("%s: SetRequest %d/%d failed: %s", target.server, target.next+1, len(requests), target.error)
+            else:
+                for result in response.response:
+                    op = gnmi_pb2.UpdateResult.Operation.Name(result.op)
+                    target.results[op] = target.results.get(op, 0) + 1
+                log.debug("%s: SetRequest %d/%d done in %1.3f seconds", target.server, target.next+1, len(requests), target.rtts[-1])
+                target.next += 1
+            if target.error is None and target.next < len(requests):
+                issue(target)
+            else:
+                target.secs = time.time() - target.start
+                inflight -= 1
+
+    except KeyboardInterrupt:
+        log.info("%s stopped by user", prog)
+        for target in targets:
+            if target.future is not None:
+                target.future.cancel()
+
+    for target in targets:
+        if target.rtts:
+            log.info("%s: %d/%d SetRequests in %1.2f seconds (max %1.3f s per request), results %s%s",
+                     target.server, target.next, len(requests), target.secs, max(target.rtts),
+                     ", ".join("%s %d" % (op, n) for (op, n) in sorted(target.results.items())) or "none",
+                     target.error and " - FAILED" or "")
+
+    failed = sum(1 for target in targets if target.error)
+    log.info("%d targets configured, %d failed", len(targets)-failed, failed)
+
+# EOF
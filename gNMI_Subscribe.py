@@ -65,20 +65,25 @@ import re
 import sys
 import os
 import time
+import random
+import threading
+import collections
+import logging
 import grpc_support
+import gnmi_capture
+import gnmi_wire
 
 ##############################################################################
 
 def gen_request( opt, log ):
     import gnmi_pb2
     mysubs = []
-    for path in opt.xpaths:
-        mypath = grpc_support.path_from_string(path)
+    for mypath in grpc_support.paths_from_strings(opt.xpaths):
         mysub = gnmi_pb2.Subscription(path=mypath, mode=opt.submode, suppress_redundant=opt.suppress, sample_interval=opt.interval*1000000000, heartbeat_interval=opt.heartbeat)
         mysubs.append(mysub)
 
     if opt.prefix:
-        myprefix = path_from_string(opt.prefix)
+        myprefix = grpc_support.path_from_string(opt.prefix)
     else:
         myprefix = None
 
@@ -90,10 +95,393 @@ def gen_request( opt, log ):
     mysblist = gnmi_pb2.SubscriptionList(prefix=myprefix, mode=opt.mode, allow_aggregation=opt.aggregate, encoding=opt.encoding, subscription=mysubs, use_aliases=opt.use_alias, qos=myqos)
     mysubreq = gnmi_pb2.SubscribeRequest( subscribe=mysblist )
 
-    log.info('Sending SubscribeRequest\n'+str(mysubreq))
+    log.info('Sending SubscribeRequest\n%s', mysubreq)
     yield mysubreq
 
-def subscribe(channel, options, log, prog):
+    if opt.alias:
+        myaliases = []
+        for (alias, path) in client_aliases(opt):
+            myaliases.append(gnmi_pb2.Alias(path=path, alias=alias))
+        mysubreq = gnmi_pb2.SubscribeRequest( aliases=gnmi_pb2.AliasList(alias=myaliases) )
+        log.info('Sending SubscribeRequest\n%s', mysubreq)
+        yield mysubreq
+
+def client_aliases(opt):
+    # --alias '#name=<xpath>' definitions as (alias, Path)
+    myaliases = []
+    for definition in opt.alias or []:
+        (alias, path) = definition.split('=', 1)
+        if not alias.startswith('#'):
+            alias = '#'+alias
+        myaliases.append((alias, grpc_support.path_from_string(path)))
+    return myaliases
+
+class PollDriver(object):
+    # Keeps the request stream of a POLL subscription open and sends a Poll
+    # every <interval> seconds on it. Each poll is matched to the next
+    # sync_response to measure the poll round-trip time.
+
+    def __init__(self, options, log):
+        self.options = options
+        self.log = log
+        self.interval = options.poll_interval or options.interval
+        self.stopped = threading.Event()
+        self.pending = collections.deque()
+        self.rtts = []
+
+    def requests(self):
+        import gnmi_pb2
+        self.pending.clear()
+        for request in gen_request( self.options, self.log ):
+            yield request
+        sent = 0
+        while not self.stopped.wait(self.interval):
+            if self.options.polls and sent >= self.options.polls:
+                break
+            self.pending.append(time.time())
+            sent += 1
+            self.log.debug("Sending Poll %d", sent)
+            yield gnmi_pb2.SubscribeRequest( poll=gnmi_pb2.Poll() )
+        # keep the stream open until the outstanding polls are answered
+        while self.pending and not self.stopped.wait(0.1):
+            pass
+
+    def synced(self):
+        # sync_responses without an outstanding poll (the initial one) are
+        # not counted
+        if self.pending:
+            self.rtts.append(time.time() - self.pending.popleft())
+            self.log.debug("Poll answered within %1.3f seconds", self.rtts[-1])
+
+    def close(self):
+        self.stopped.set()
+
+    def report(self):
+        if self.rtts:
+            rtts = sorted(self.rtts)
+            pick = lambda p: rtts[min(len(rtts)-1, int(len(rtts)*p/100.0))]*1000
+            self.log.info("%d polls, round-trip p50 %1.1f p90 %1.1f p99 %1.1f max %1.1f ms",
+                          len(rtts), pick(50), pick(90), pick(99), rtts[-1]*1000)
+
+
+class Handler(object):
+    # Handles the responses of one subscription. The same handler is used
+    # for live, resubscribed and replayed streams, so counters, sinks and
+    # the capture file carry across reconnects.
+
+    def __init__(self, options, log, forward=None):
+        # forward: optional callable receiving every raw SubscribeResponse
+        self.options = options
+        self.log = log
+        self.forward = forward
+
+        self.msgs = 0
+        self.upds = 0
+        self.secs = 0
+        self.start = 0
+
+        # client-defined aliases are known upfront, target-defined ones are
+        # learned from the stream
+        self.aliases = grpc_support.AliasTable()
+        for (alias, path) in client_aliases(options):
+            self.aliases.define(alias, path)
+
+        # PollDriver of a POLL subscription, told about each sync_response
+        self.poller = None
+
+        # set when a stream is re-established, cleared by its sync_response
+        self.resync = None
+        self.resyncs = []
+
+        # per-subscription-path statistics, logged with --stats
+        if options.stats or options.stats_file:
+            import gnmi_stats
+            self.stats = gnmi_stats.SubscriptionStats(options.xpaths, log, options.report, options.stats_file, options.stats, options.prefix)
+        else:
+            self.stats = None
+
+        # --spool writes captures or output lines into rotating segments
+        if options.spool:
+            import gnmi_spool
+            if options.spool_format == 'capture':
+                header = gnmi_capture.MAGIC
+                extension = 'cap'
+            else:
+                header = b''
+                extension = options.spool_format == 'jsonl' and 'jsonl' or 'txt'
+            self.spool = gnmi_spool.Spool(options.spool, log, extension, header, options.spool_size*1048576, options.spool_interval, options.spool_compress)
+        else:
+            self.spool = None
+
+        if options.record:
+            self.recorder = gnmi_capture.Recorder(options.record)
+        elif self.spool and options.spool_format == 'capture':
+            self.recorder = gnmi_capture.Recorder(self.spool)
+        else:
+            self.recorder = None
+
+        # Updates are only rendered when something will be emitted, --stats
+        # and --output none only count (and forward) the raw messages. Log
+        # messages pass the response as argument, so text_format only runs
+        # in a logging handler.
+        render = not options.stats and options.output != "none"
+
+        # with --match only the routed updates are written
+        if render and (options.match or options.match_file):
+            import gnmi_match
+            self.router = gnmi_match.Router(log)
+            for definition in options.match or []:
+                (name, xpath) = definition.split('=', 1)
+                self.router.route(name, xpath)
+            if options.match_file:
+                for (name, xpath) in gnmi_match.read_rules(options.match_file):
+                    self.router.route(name, xpath)
+            if options.match_dir:
+                self.router.output(options.match_dir, options.batch, options.flush_interval)
+            else:
+                writer = grpc_support.XpathWriter(options.outfile or options.logfile, options.batch, options.flush_interval)
+                for name in self.router.names():
+                    self.router.sinks[name] = writer
+            render = False
+        else:
+            self.router = None
+
+        # xpath and jsonl output is batched, into --outfile when given
+        if render and options.output == "xpath":
+            self.writer = grpc_support.XpathWriter(options.outfile or options.logfile, options.batch, options.flush_interval)
+        elif render and options.output == "jsonl":
+            import gnmi_json
+            self.writer = gnmi_json.JsonlWriter(options.outfile or options.logfile, options.replay or options.server, options.batch, options.flush_interval)
+        else:
+            self.writer = None
+
+        # notification sinks: write(notification), flush() and close()
+        self.sinks = []
+        if self.writer:
+            self.sinks.append(self.writer)
+        if self.router:
+            self.sinks.append(self.router)
+        if self.spool and options.spool_format == 'xpath':
+            self.sinks.append(grpc_support.XpathWriter(self.spool, options.batch, options.flush_interval))
+        elif self.spool and options.spool_format == 'jsonl':
+            import gnmi_json
+            self.sinks.append(gnmi_json.JsonlWriter(self.spool, options.replay or options.server, options.batch, options.flush_interval))
+        if options.columnar:
+            import gnmi_columnar
+            self.sinks.append(gnmi_columnar.ColumnarSink(options.columnar, log, options.columnar_format, options.columnar_size))
+
+        # current device state, readable by in-process users of the handler
+        if options.state:
+            import gnmi_state
+            self.state = gnmi_state.StateTree()
+            self.sinks.append(self.state)
+        else:
+            self.state = None
+
+        self.logstash = render and options.logstash and log.isEnabledFor(logging.INFO)
+        self.raw = render and not self.writer and log.isEnabledFor(logging.INFO)
+
+        # Updates of a --lazy subscription are not decoded at all when only
+        # recorded, and are dropped before decoding when outside --filter.
+        self.decode = bool(self.sinks or self.logstash or self.raw or forward or self.stats or options.alias or options.use_alias)
+        if options.filter:
+            self.filter = gnmi_wire.PathFilter(options.filter, self.aliases)
+        else:
+            self.filter = None
+        self.archived = 0
+        self.filtered = 0
+
+        # the batched writers, their lines can be formatted ahead of writing
+        self.formatted = [sink for sink in self.sinks if isinstance(sink, grpc_support.XpathWriter)]
+
+        # With --pipeline a Receiver thread reads the stream as serialized
+        # responses. Decoding, formatting and the sinks run in stages of
+        # their own, so a slow sink does not hold back the stream; decode and
+        # format stages may have several workers and keep the stream order.
+        self.receiver = None
+        if options.pipeline:
+            import gnmi_pipeline
+            sink = gnmi_pipeline.Stage('sink', lambda item: self.emit(*item), options.queue_size, log)
+            formatter = gnmi_pipeline.Stage('format', self.format, options.queue_size, log, options.format_workers, sink.put)
+            decode = gnmi_pipeline.Stage('decode', self.decode_raw, options.queue_size, log, options.decode_workers, self.dispatch)
+            self.stages = [decode, formatter, sink]
+            self.parse = decode.put
+            self.output = formatter.put
+            if options.stats:
+                level = logging.INFO
+            else:
+                level = logging.DEBUG
+            self.monitor = gnmi_pipeline.Monitor(self.queues, options.report, log, level)
+        else:
+            self.stages = []
+            self.parse = lambda data: self.dispatch(self.decode_raw(data))
+            self.output = self.emit
+
+    def receive(self, responses):
+        # the response stream as consumed by the handler
+        if not self.options.pipeline:
+            return responses
+        import gnmi_pipeline
+        self.receiver = gnmi_pipeline.Receiver(responses, self.options.queue_size, self.log)
+        return self.receiver
+
+    def queues(self):
+        queues = []
+        if self.receiver:
+            queues.append(self.receiver.queue)
+        return queues + self.stages
+
+    def handle(self, response):
+        if self.recorder:
+            self.recorder.record(response)
+        self.dispatch(response)
+
+    def handle_raw(self, data):
+        # Serialized response of a --lazy or --pipeline subscription. With
+        # --lazy updates outside the --filter are dropped before decoding and
+        # recording, the others are only decoded when something consumes
+        # them.
+        response = None
+        if self.options.lazy:
+            (kind, prefix, updates, deletes, alias) = gnmi_wire.peek(data)
+            if kind == gnmi_wire.UPDATE and not alias:
+                if self.filter:
+                    passed = self.filter.select(prefix, updates, deletes)
+                    if passed is False:
+                        self.filtered += 1
+                        return
+                    if passed is not True:
+                        # some updates pass, the others are removed
+                        import gnmi_pb2
+                        response = gnmi_pb2.SubscribeResponse.FromString(data)
+                        notification = response.update
+                        for (field, flags) in zip((notification.update, notification.delete), passed):
+                            kept = [item for (item, flag) in zip(field, flags) if flag]
+                            del field[:]
+                            field.extend(kept)
+                if not self.decode:
+                    self.record(data, response)
+                    self.archived += 1
+                    return
+        self.record(data, response)
+        if response is None:
+            self.parse(data)
+        else:
+            self.parse(response)
+
+    def record(self, data, response=None):
+        # <response> is the decoded <data> when the --filter trimmed it
+        if self.recorder:
+            if response is not None:
+                data = response.SerializeToString()
+            self.recorder.write(data)
+
+    def decode_raw(self, data):
+        # responses trimmed by the --filter come decoded already
+        if isinstance(data, bytes):
+            import gnmi_pb2
+            data = gnmi_pb2.SubscribeResponse.FromString(data)
+        return data
+
+    def dispatch(self, response):
+        log = self.log
+        if response.HasField('sync_response'):
+            log.debug('Sync Response received\n%s', response)
+            self.output(response)
+            if self.poller:
+                self.poller.synced()
+            if self.resync:
+                self.resyncs.append(time.time() - self.resync)
+                self.resync = None
+                log.info("Resynchronized %1.2f seconds after the stream broke", self.resyncs[-1])
+            # start is not set when the sync_response precedes any update
+            if self.start:
+                self.secs += time.time() - self.start
+                self.start = 0
+            if self.options.stats:
+                log.info("%d updates and %d messages within %1.2f seconds", self.upds, self.msgs, self.secs)
+                if self.secs > 0:
+                    log.info("Statistics: %5.0f upd/sec, %5.0f msg/sec", self.upds/self.secs, self.msgs/self.secs)
+        elif response.HasField('error'):
+            log.error('gNMI Error %d received\n%s', response.error.code, response.error.message)
+        elif response.HasField('update'):
+            notification = response.update
+            if self.aliases.learn(notification):
+                log.debug('Alias %s defined', notification.alias)
+                return
+            self.aliases.resolve(notification)
+            if self.start==0:
+                self.start=time.time()
+            self.msgs += 1
+            self.upds += len(response.update.update)
+            if self.stats:
+                self.stats.update(response)
+            if self.forward:
+                self.forward(response)
+            self.output(response)
+        else:
+            log.error('Unknown response received:\n%s', response)
+
+    def format(self, response):
+        # (response, {writer: lines}) for the sink stage, the lines of the
+        # batched writers formatted ahead
+        lines = None
+        if self.formatted and response.HasField('update'):
+            lines = {}
+            for writer in self.formatted:
+                lines[writer] = []
+                writer.format(response.update, lines[writer])
+        return (response, lines)
+
+    def emit(self, response, lines=None):
+        # output of an update, or the flush at a sync_response
+        if response.HasField('sync_response'):
+            if self.writer:
+                self.writer.flush()
+            if self.router:
+                self.router.flush()
+            return
+        if self.logstash:
+            self.log.info(response.update.update)
+        for sink in self.sinks:
+            if lines is not None and sink in lines:
+                sink.extend(lines[sink])
+            else:
+                sink.write(response.update)
+        if self.raw:
+            self.log.info('Update received\n%s', response)
+
+    def close(self):
+        if self.stages:
+            self.monitor.close()
+            # in stream order, each stage drains into the next
+            for stage in self.stages:
+                stage.close()
+            import gnmi_pipeline
+            gnmi_pipeline.log_metrics(self.log, logging.INFO, self.queues())
+        for sink in self.sinks:
+            sink.close()
+        if self.stats:
+            self.stats.close()
+        if self.state is not None:
+            import gnmi_state
+            with open(self.options.state, 'w') as f:
+                gnmi_state.dump(self.state, f)
+            self.log.info("%d leaves of state written to %s", len(self.state), self.options.state)
+        if self.recorder:
+            self.recorder.close()
+        if self.spool:
+            self.spool.close()
+
+
+def backoff(attempt, options):
+    # full jitter: uniform between 0 and the capped exponential delay; the
+    # exponent stops growing long after the cap is reached
+    return random.uniform(0, min(options.backoff_max, options.backoff * 2**min(attempt, 32)))
+
+
+def subscribe(channel, options, log, prog, forward=None):
+    # forward: optional callable receiving every raw SubscribeResponse
     try:
         import grpc
         import gnmi_pb2
@@ -101,56 +489,107 @@ def subscribe(channel, options, log, prog):
         log.error(str(err))
         quit()
 
-    log.debug("Create gNMI stub")
-    stub = gnmi_pb2.gNMIStub(channel)
+    if options.replay:
+        log.info("Replaying %s", options.replay)
+    else:
+        log.debug("Create gNMI stub")
+        stub = gnmi_pb2.gNMIStub(channel)
+        metadata = [('username',options.username), ('password', options.password)]
+        if options.lazy or options.pipeline:
+            # responses are passed on as received, without deserializer
+            subscribe_call = channel.stream_stream('/gnmi.gNMI/Subscribe', request_serializer=gnmi_pb2.SubscribeRequest.SerializeToString, response_deserializer=None)
+        else:
+            subscribe_call = stub.Subscribe
 
-    req_iterator = gen_request( options, log )
-    metadata = [('username',options.username), ('password', options.password)]
+    handler = Handler(options, log, forward)
+    if options.lazy or options.pipeline:
+        handle = handler.handle_raw
+    else:
+        handle = handler.handle
+    if options.mode == 2 and not options.replay:
+        handler.poller = PollDriver(options, log)
+    attempt = 0
+    reconnects = 0
 
-    msgs = 0
-    upds = 0
-    secs = 0
-    start = 0
+    # --timeout bounds the whole run, resubscriptions included
+    if options.timeout:
+        deadline = time.time() + options.timeout
+    else:
+        deadline = None
 
-    try:
-        responses = stub.Subscribe(req_iterator, options.timeout, metadata=metadata)
-        for response in responses:
-            if response.HasField('sync_response'):
-                log.debug('Sync Response received\n'+str(response))
-                secs += time.time() - start
-                start = 0
-                if options.stats:
-                    log.info("%d updates and %d messages within %1.2f seconds", upds, msgs, secs)
-                    log.info("Statistics: %5.0f upd/sec, %5.0f msg/sec", upds/secs, msgs/secs)
-            elif response.HasField('error'):
-                log.error('gNMI Error '+str(response.error.code)+' received\n'+str(response.error.message))
-            elif response.HasField('update'):
-                if start==0:
-                    start=time.time()
-                msgs += 1
-                upds += len(response.update.update)
-                if not options.stats:
-                    if options.logstash:
-                        log.info(response.update.update)
-                    if options.output == "xpath":
-                        log.info(grpc_support.xpath_output(response.update))
-                    else:
-                        log.info('Update received\n'+str(response))
+    while True:
+        try:
+            if options.replay:
+                responses = gnmi_capture.replay(options.replay, options.pace, raw=options.lazy or options.pipeline)
             else:
-                log.error('Unknown response received:\n'+str(response))
+                if handler.poller:
+                    requests = handler.poller.requests()
+                else:
+                    requests = gen_request( options, log )
+                if deadline is None:
+                    remaining = None
+                else:
+                    remaining = deadline - time.time()
+                responses = subscribe_call(requests, remaining, metadata=metadata)
+            for response in handler.receive(responses):
+                handle(response)
+                # the sync_response of a re-established stream clears resync
+                if attempt and handler.resync is None:
+                    attempt = 0
+
+            if not (options.resubscribe and options.mode == 0 and not options.replay):
+                break
+            log.error("Subscription closed by the target")
+
+        except KeyboardInterrupt:
+            log.info("%s stopped by user", prog)
+            break
+
+        except grpc.RpcError as x:
+            log.error("grpc.RpcError received:\n%s", x.details())
+            if not options.resubscribe or x.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                break
+
+        except Exception as err:
+            log.error(err)
+            break
+
+        # re-send the same SubscriptionList after a jittered backoff, the
+        # time to resync is taken from the first failure
+        if handler.resync is None:
+            handler.resync = time.time()
+        delay = backoff(attempt, options)
+        if deadline is not None and time.time() + delay >= deadline:
+            log.info("Subscription timeout reached, not resubscribing")
+            break
+        attempt += 1
+        reconnects += 1
+        log.info("Resubscribing in %1.2f seconds (reconnect %d)", delay, reconnects)
+        try:
+            time.sleep(delay)
+        except KeyboardInterrupt:
+            log.info("%s stopped by user", prog)
+            break
+
+    handler.close()
 
-    except KeyboardInterrupt:
-        log.info("%s stopped by user", prog)
+    if handler.poller:
+        handler.poller.close()
+        handler.poller.report()
 
-    except grpc.RpcError as x:
-        log.error("grpc.RpcError received:\n%s", x.details)
+    if reconnects:
+        resyncs = sorted(handler.resyncs)
+        if resyncs:
+            log.info("%d reconnects, time to resync min %1.2f max %1.2f seconds", reconnects, resyncs[0], resyncs[-1])
+        else:
+            log.info("%d reconnects", reconnects)
 
-    except Exception as err:
-        log.error(err)
+    if handler.archived or handler.filtered:
+        log.info("%d update messages archived without decoding, %d dropped by filter", handler.archived, handler.filtered)
 
-    if (msgs>1):
-        log.info("%d update messages received", msgs)
-        return msgs
+    if (handler.msgs>1):
+        log.info("%d update messages received", handler.msgs)
+        return handler.msgs
 
 # EOF
 
@@ -0,0 +1,450 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gNMI_Target.py                                                            #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Local gNMI stand-in target serving a synthetic data tree, used for      #
+#    offline testing and load generation against the pygnmi clients          #
+#                                                                            #
+#  Features supported:                                                       #
+#                                                                            #
+#    - gNMI Capabilities                                                     #
+#    - gNMI Get                                                              #
+#    - gNMI Set (acknowledged, the tree is not changed)                      #
+#    - gNMI Subscribe STREAM, ONCE and POLL (SAMPLE and ON_CHANGE)           #
+#    - configurable tree size, update rate and TypedValue encoding           #
+#    - optional notification prefix and target-defined aliases               #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI stand-in target in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gNMI_Target"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import argparse
+import struct
+import sys
+import os
+import time
+import grpc_support
+import gnmi_pb2
+
+##############################################################################
+#
+# Subscribe responses are encoded straight to protobuf wire format from
+# pre-serialized paths, so the target is not limited by message building.
+# Field numbers are taken from gnmi.proto.
+#
+
+def _varint(value):
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def _field(tag, data):
+    # length-delimited field, tag is the pre-shifted key byte
+    return tag + _varint(len(data)) + data
+
+def _path(parsed):
+    # gnmi.Path from the parse_path() form: elem=3, PathElem name=1 key=2
+    elems = []
+    for (name, keys) in parsed:
+        elem = _field(b'\x0a', name.encode('utf-8'))
+        for (k, v) in keys:
+            elem += _field(b'\x12', _field(b'\x0a', k.encode('utf-8')) + _field(b'\x12', v.encode('utf-8')))
+        elems.append(_field(b'\x1a', elem))
+    return b''.join(elems)
+
+_value_encoders = {
+    'json':      lambda v: _field(b'\x52', str(v).encode('ascii')),
+    'json_ietf': lambda v: _field(b'\x5a', str(v).encode('ascii')),
+    'string':    lambda v: _field(b'\x0a', str(v).encode('ascii')),
+    'ascii':     lambda v: _field(b'\x62', str(v).encode('ascii')),
+    'int':       lambda v: b'\x10' + _varint(v),
+    'uint':      lambda v: b'\x18' + _varint(v),
+    'float':     lambda v: b'\x35' + struct.pack('<f', v),
+}
+
+# SubscriptionList encoding to the TypedValue kind used by default
+_encoding_values = ['json', 'json', 'int', 'ascii', 'json_ietf']
+
+SYNC_RESPONSE = b'\x18\x01'
+
+
+class SyntheticTree(object):
+    # <paths> leaves spread over containers of <leaves> counters each:
+    #   /state/port[port-id=1/1/<n>]/statistics/counter-<m>
+
+    def __init__(self, paths, leaves):
+        self.containers = []
+        self.leaves = []
+        n = 0
+        while len(self.leaves) < paths:
+            n += 1
+            container = (('state', ()), ('port', (('port-id', '1/1/%d' % n),)), ('statistics', ()))
+            self.containers.append(container)
+            for m in range(min(leaves, paths-len(self.leaves))):
+                self.leaves.append((len(self.containers)-1, ('counter-%d' % m, ())))
+        self.encoded = {}
+
+    def full_path(self, leaf):
+        (c, elem) = self.leaves[leaf]
+        return self.containers[c] + (elem,)
+
+    def encode(self, use_prefix, aliases):
+        # (prefix fields, alias definitions, update path fields), built once
+        # per tree and shared by all streams using the same layout
+        layout = (use_prefix, aliases)
+        if layout not in self.encoded:
+            prefixes = []
+            definitions = []
+            for (c, container) in enumerate(self.containers):
+                path = _path(container)
+                if aliases:
+                    alias = '#p%d' % c
+                    definitions.append(_field(b'\x12', path) + _field(b'\x1a', alias.encode('ascii')))
+                    path = _path(((alias, ()),))
+                prefixes.append(_field(b'\x12', path))
+            paths = []
+            for leaf in range(len(self.leaves)):
+                if use_prefix:
+                    parsed = (self.leaves[leaf][1],)
+                else:
+                    parsed = self.full_path(leaf)
+                paths.append(_field(b'\x0a', _path(parsed)))
+            self.encoded[layout] = (prefixes, definitions, paths)
+        return self.encoded[layout]
+
+    def match(self, parsed):
+        # leaf indexes under the subscription path, '*' matches any name/key
+        if not parsed:
+            return list(range(len(self.leaves)))
+        matched = []
+        for leaf in range(len(self.leaves)):
+            full = self.full_path(leaf)
+            if len(parsed) > len(full):
+                continue
+            for ((name, keys), (fname, fkeys)) in zip(parsed, full):
+                if name != fname and name != '*':
+                    break
+                fkeys = dict(fkeys)
+                if any(fkeys.get(k) != v and v != '*' for (k, v) in keys):
+                    break
+            else:
+                matched.append(leaf)
+        return matched
+
+
+class Stream(object):
+    # wire encoder for the notifications of one Subscribe or Get call
+
+    def __init__(self, tree, options, kind, aliases=False):
+        self.tree = tree
+        self.options = options
+        self.encode = _value_encoders[kind]
+        self.aliases = aliases
+        self.value = 0
+        (self.prefixes, self.definitions, self.paths) = tree.encode(options.use_prefix, aliases)
+
+    def alias_notifications(self, leaves):
+        # target-defined alias for every container prefix in use
+        ts = b'\x08' + _varint(int(time.time()*1000000000))
+        for c in sorted(set(self.tree.leaves[leaf][0] for leaf in leaves)):
+            yield ts + self.definitions[c]
+
+    def notifications(self, leaves):
+        # leaves are grouped per container when a prefix is used
+        batch = self.options.batch
+        ts = b'\x08' + _varint(int(time.time()*1000000000))
+        group = []
+        current = None
+        for leaf in leaves:
+            c = self.tree.leaves[leaf][0]
+            if group and (len(group) >= batch or (self.options.use_prefix and c != current)):
+                yield self._notification(ts, current, group)
+                group = []
+            current = c
+            group.append(leaf)
+        if group:
+            yield self._notification(ts, current, group)
+
+    def _notification(self, ts, c, group):
+        self.value += 1
+        if self.options.value == 'float':
+            value = float(self.value)
+        else:
+            value = self.value
+        val = _field(b'\x1a', self.encode(value))
+        updates = b''.join(_field(b'\x22', self.paths[leaf] + val) for leaf in group)
+        if self.options.use_prefix:
+            return ts + self.prefixes[c] + updates
+        return ts + updates
+
+    def responses(self, leaves):
+        for notification in self.notifications(leaves):
+            yield _field(b'\x0a', notification)
+
+
+class Target(gnmi_pb2.gNMIServicer):
+
+    def __init__(self, options, log):
+        self.options = options
+        self.log = log
+        self.tree = SyntheticTree(options.paths, options.leaves)
+        self.tree.encode(options.use_prefix, False)
+        log.info("Synthetic tree with %d leaves in %d containers", len(self.tree.leaves), len(self.tree.containers))
+
+    def value_kind(self, encoding):
+        if self.options.value:
+            return self.options.value
+        return _encoding_values[encoding]
+
+    def matching(self, prefix, paths):
+        leaves = set()
+        for path in paths:
+            parsed = grpc_support.parsed_from_path(prefix) + grpc_support.parsed_from_path(path)
+            leaves.update(self.tree.match(parsed))
+        return sorted(leaves)
+
+    def Capabilities(self, request, context):
+        return gnmi_pb2.CapabilityResponse(
+            supported_models=[gnmi_pb2.ModelData(name='pygnmi-synthetic', organization='pygnmi', version='1.0')],
+            supported_encodings=[gnmi_pb2.JSON, gnmi_pb2.PROTO, gnmi_pb2.ASCII, gnmi_pb2.JSON_IETF],
+            gNMI_version='0.4.0')
+
+    def Get(self, request, context):
+        leaves = self.matching(request.prefix, request.path)
+        stream = Stream(self.tree, self.options, self.value_kind(request.encoding))
+        return gnmi_pb2.GetResponse.FromString(b''.join(_field(b'\x0a', n) for n in stream.notifications(leaves)))
+
+    def Set(self, request, context):
+        # acknowledged only, the synthetic tree is not changed
+        results = []
+        for path in request.delete:
+            results.append(gnmi_pb2.UpdateResult(path=path, op=gnmi_pb2.UpdateResult.DELETE))
+        for u in request.replace:
+            results.append(gnmi_pb2.UpdateResult(path=u.path, op=gnmi_pb2.UpdateResult.REPLACE))
+        for u in request.update:
+            results.append(gnmi_pb2.UpdateResult(path=u.path, op=gnmi_pb2.UpdateResult.UPDATE))
+        return gnmi_pb2.SetResponse(prefix=request.prefix, response=results, timestamp=int(time.time()*1000000000))
+
+    def Subscribe(self, request_iterator, context):
+        request = next(request_iterator)
+        if not request.HasField('subscribe'):
+            import grpc
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'first SubscribeRequest must be a SubscriptionList')
+        sublist = request.subscribe
+        stream = Stream(self.tree, self.options, self.value_kind(sublist.encoding), sublist.use_aliases and self.options.use_prefix)
+
+        subs = []
+        for sub in sublist.subscription:
+            subs.append((sub, self.matching(sublist.prefix, [sub.path])))
+        leaves = sorted(set(leaf for (sub, matched) in subs for leaf in matched))
+        self.log.info("Subscribe %s: %d leaves, mode %s", context.peer(), len(leaves), gnmi_pb2.SubscriptionList.Mode.Name(sublist.mode))
+
+        if stream.aliases:
+            for definition in stream.alias_notifications(leaves):
+                yield _field(b'\x0a', definition)
+
+        if not sublist.updates_only:
+            for response in stream.responses(leaves):
+                yield response
+        yield SYNC_RESPONSE
+
+        if sublist.mode == gnmi_pb2.SubscriptionList.ONCE:
+            return
+
+        if sublist.mode == gnmi_pb2.SubscriptionList.POLL:
+            for request in request_iterator:
+                if request.HasField('poll'):
+                    for response in stream.responses(leaves):
+                        yield response
+                    yield SYNC_RESPONSE
+            return
+
+        for response in self.stream(stream, subs, context):
+            yield response
+
+    def stream(self, stream, subs, context):
+        # SAMPLE (and TARGET_DEFINED) leaves are all sent every interval,
+        # ON_CHANGE leaves are changed round robin at --rate updates/sec
+        sample = []
+        changes = []
+        for (sub, matched) in subs:
+            if sub.mode == gnmi_pb2.ON_CHANGE:
+                changes.extend(matched)
+            else:
+                if self.options.sample:
+                    interval = self.options.sample/1000.0
+                elif sub.sample_interval:
+                    interval = sub.sample_interval/1000000000.0
+                else:
+                    interval = 1.0
+                sample.append([time.time()+interval, interval, matched])
+
+        batch = self.options.batch
+        if self.options.rate:
+            gap = float(batch)/self.options.rate
+        else:
+            gap = 0.0
+        nextChange = time.time()
+        position = 0
+
+        while context.is_active():
+            now = time.time()
+            for entry in sample:
+                if entry[0] <= now:
+                    for response in stream.responses(entry[2]):
+                        yield response
+                    entry[0] += entry[1]
+                    if entry[0] < now:
+                        # fell behind, skip missed intervals
+                        entry[0] = now + entry[1]
+
+            if changes and nextChange <= now:
+                changed = changes[position:position+batch]
+                position += batch
+                if position >= len(changes):
+                    position = 0
+                for response in stream.responses(changed):
+                    yield response
+                nextChange += gap
+                if nextChange < now - 1.0:
+                    nextChange = now
+                continue
+
+            wake = [entry[0] for entry in sample]
+            if changes:
+                wake.append(nextChange)
+            if not wake:
+                # nothing to stream, just hold the subscription open
+                wake.append(now + 1.0)
+            delay = min(wake) - time.time()
+            if delay > 0:
+                time.sleep(min(delay, 1.0))
+
+
+def add_target_to_server(servicer, server):
+    # as gnmi_pb2.add_gNMIServicer_to_server, but Subscribe responses are
+    # passed through as already serialized bytes
+    import grpc
+    rpc_method_handlers = {
+        'Capabilities': grpc.unary_unary_rpc_method_handler(
+            servicer.Capabilities,
+            request_deserializer=gnmi_pb2.CapabilityRequest.FromString,
+            response_serializer=gnmi_pb2.CapabilityResponse.SerializeToString,
+        ),
+        'Get': grpc.unary_unary_rpc_method_handler(
+            servicer.Get,
+            request_deserializer=gnmi_pb2.GetRequest.FromString,
+            response_serializer=gnmi_pb2.GetResponse.SerializeToString,
+        ),
+        'Set': grpc.unary_unary_rpc_method_handler(
+            servicer.Set,
+            request_deserializer=gnmi_pb2.SetRequest.FromString,
+            response_serializer=gnmi_pb2.SetResponse.SerializeToString,
+        ),
+        'Subscribe': grpc.stream_stream_rpc_method_handler(
+            servicer.Subscribe,
+            request_deserializer=gnmi_pb2.SubscribeRequest.FromString,
+            response_serializer=None,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler('gnmi.gNMI', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+def start(options, log):
+    # returns the started grpc.server and the bound port, the caller owns stop()
+    try:
+        import grpc
+        from concurrent import futures
+    except ImportError as err:
+        log.error(str(err))
+        quit()
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=options.workers))
+    add_target_to_server(Target(options, log), server)
+    if options.cert:
+        cred = grpc.ssl_server_credentials([(open(options.key, 'rb').read(), open(options.cert, 'rb').read())])
+        port = server.add_secure_port(options.listen, cred)
+    else:
+        port = server.add_insecure_port(options.listen)
+    server.start()
+    log.info("gNMI target listening on %s (port %d)", options.listen, port)
+    return (server, port)
+
+##############################################################################
+
+def get_options(argv=None):
+    prog = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--version', action='version', version=prog+' '+__version__)
+
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-q', '--quiet',   action='store_true', help='disable logging')
+    group.add_argument('-v', '--verbose', action='count', help='enhanced logging')
+    group = parser.add_argument_group()
+    group.add_argument('--listen', default='localhost:57400', help='address/port to listen on (default: localhost:57400)')
+    group.add_argument('--cert', metavar='<filename>', help='server certificate chain (enables TLS)')
+    group.add_argument('--key', metavar='<filename>', help='server private key')
+    group.add_argument('--workers', default=16, type=int, help='concurrent RPCs (default: 16)')
+    group.add_argument('--logfile', metavar='<filename>', type=argparse.FileType('wb', 0), default='-', help='Specify the logfile (default: <stdout>)')
+
+    group = parser.add_argument_group()
+    group.add_argument('--paths', default=1000, type=int, help='number of leaves in the synthetic tree (default: 1000)')
+    group.add_argument('--leaves', default=16, type=int, help='leaves per container (default: 16)')
+    group.add_argument('--value', choices=sorted(_value_encoders), help='TypedValue kind (default: from requested encoding)')
+    group.add_argument('--use_prefix', action='store_true', help='send container paths as notification prefix')
+    group.add_argument('--batch', default=100, type=int, help='updates per notification (default: 100)')
+    group.add_argument('--rate', default=1000, type=int, help='ON_CHANGE updates/sec per subscription, 0 for unlimited (default: 1000)')
+    group.add_argument('--sample', type=int, help='override SAMPLE interval in milliseconds')
+    options = parser.parse_args(argv)
+
+    return(options,prog)
+
+
+if __name__ == '__main__':
+    (options,prog) = get_options()
+
+    log = grpc_support.setup_log(options,prog)
+
+    (server, port) = start(options, log)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        log.info("%s stopped by user", prog)
+        server.stop(0)
+
+# EOF
@@ -0,0 +1,148 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_capture.py                                                           #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    Binary capture and replay of SubscribeResponse streams                  #
+#                                                                            #
+#  Capture file format:                                                      #
+#                                                                            #
+#    8 byte magic "GNMICAP1", followed by one record per response:           #
+#      uint64 receive time (ns since epoch, big endian)                      #
+#      uint32 length (big endian)                                            #
+#      <length> bytes serialized SubscribeResponse                           #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI capture and replay in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_capture"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import mmap
+import struct
+import time
+
+##############################################################################
+
+MAGIC = b'GNMICAP1'
+RECORD = struct.Struct('>QI')
+
+
+class Recorder(object):
+
+    def __init__(self, filename, buffering=1048576):
+        # filename may also be an open file writing MAGIC itself, like a
+        # gnmi_spool.Spool
+        self.owned = not hasattr(filename, 'write')
+        if self.owned:
+            self.file = open(filename, 'wb', buffering)
+            self.file.write(MAGIC)
+        else:
+            self.file = filename
+
+    def write(self, data, timestamp=None):
+        # data is an already serialized SubscribeResponse, written with its
+        # record header in one call so a spool never splits a record
+        if timestamp is None:
+            timestamp = int(time.time()*1000000000)
+        self.file.write(RECORD.pack(timestamp, len(data)) + data)
+
+    def record(self, response):
+        self.write(response.SerializeToString())
+
+    def close(self):
+        if self.owned:
+            self.file.close()
+
+
+def _records(data, filename):
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(filename+' is not a gNMI capture file')
+    offset = len(MAGIC)
+    size = len(data)
+    while offset + RECORD.size <= size:
+        (timestamp, length) = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if offset + length > size:
+            # truncated last record, capture was interrupted
+            break
+        yield (timestamp, data[offset:offset+length])
+        offset += length
+
+def read_capture(filename):
+    # yields (receive time ns, serialized response) from a memory map, or
+    # from memory for gzip/zstd compressed spool segments
+    if filename.endswith('.gz'):
+        import gzip
+        with gzip.open(filename, 'rb') as f:
+            data = f.read()
+        for record in _records(data, filename):
+            yield record
+        return
+    if filename.endswith('.zst'):
+        import zstandard
+        with open(filename, 'rb') as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        for record in _records(data, filename):
+            yield record
+        return
+    with open(filename, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            raise ValueError(filename+' is not a gNMI capture file')
+        try:
+            for record in _records(data, filename):
+                yield record
+        finally:
+            data.close()
+
+
+def replay(filename, pace=False, raw=False):
+    # SubscribeResponse messages from a capture, as fast as possible or with
+    # the original spacing between them; serialized when <raw>
+    import gnmi_pb2
+
+    start = None
+    for (timestamp, data) in read_capture(filename):
+        if pace:
+            if start is None:
+                start = (timestamp, time.time())
+            else:
+                delay = start[1] + (timestamp - start[0])/1000000000.0 - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+        if raw:
+            yield data
+        else:
+            yield gnmi_pb2.SubscribeResponse.FromString(data)
+
+# EOF
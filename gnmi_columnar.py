@@ -0,0 +1,225 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_columnar.py                                                          #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    Buffers numeric leaves in per-path NumPy columns (timestamp, value)     #
+#    and writes them in batches to NPZ or Parquet files.                     #
+#    Requires numpy, Parquet output requires pyarrow.                        #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI columnar telemetry buffers in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_columnar"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import os
+import time
+import grpc_support
+import gnmi_json
+
+##############################################################################
+
+INT64_MAX = 9223372036854775807
+
+def _json_number(raw):
+    # JSON encoded numbers, SR OS sends 64-bit counters as quoted strings
+    try:
+        value = gnmi_json.decode(raw)
+    except ValueError:
+        return None
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    if isinstance(value, (int, float)):
+        return value
+    return None
+
+_numeric_values = {
+    'int_val':       lambda v: v.int_val,
+    'uint_val':      lambda v: v.uint_val,
+    'float_val':     lambda v: v.float_val,
+    'json_val':      lambda v: _json_number(v.json_val),
+    'json_ietf_val': lambda v: _json_number(v.json_ietf_val),
+}
+
+def numeric_value(val):
+    # int or float for numeric TypedValues, None for everything else
+    reader = _numeric_values.get(val.WhichOneof('value'))
+    if reader is None:
+        return None
+    value = reader(val)
+    if isinstance(value, bool):
+        return None
+    return value
+
+
+class Column(object):
+    # timestamp/value buffer of one path, capacity doubles up to <size>
+
+    __slots__ = ('timestamps', 'values', 'count', 'size')
+
+    def __init__(self, np, value, size):
+        capacity = min(64, size)
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        if isinstance(value, float) or value > INT64_MAX:
+            self.values = np.empty(capacity, dtype=np.float64)
+        else:
+            self.values = np.empty(capacity, dtype=np.int64)
+        self.count = 0
+        self.size = size
+
+    def append(self, np, timestamp, value):
+        # returns True when the column is full
+        n = self.count
+        if n == len(self.timestamps):
+            capacity = min(n*2, self.size)
+            self.timestamps = np.resize(self.timestamps, capacity)
+            self.values = np.resize(self.values, capacity)
+        if self.values.dtype == np.int64 and (isinstance(value, float) or value > INT64_MAX):
+            self.values = self.values.astype(np.float64)
+        self.timestamps[n] = timestamp
+        self.values[n] = value
+        self.count = n+1
+        return self.count >= self.size
+
+
+class ColumnarSink(object):
+    # Notification sink keeping numeric leaves only. When a column is full
+    # all columns are written as one batch file and reset.
+
+    def __init__(self, directory, log, format='npz', size=1024):
+        try:
+            import numpy
+            if format == 'parquet':
+                import pyarrow
+                import pyarrow.parquet
+        except ImportError as err:
+            log.error(str(err))
+            quit()
+
+        if format not in ('npz', 'parquet'):
+            log.error("Unsupported columnar format "+format)
+            quit()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.np = numpy
+        self.directory = directory
+        self.log = log
+        self.format = format
+        self.size = size
+        self.columns = {}
+        self.batches = 0
+        self.run = time.strftime('%Y%m%d-%H%M%S')
+
+    def write(self, notification):
+        np = self.np
+        columns = self.columns
+        timestamp = notification.timestamp
+        if notification.prefix.elem:
+            prefix = grpc_support.string_from_path(notification.prefix)
+        else:
+            prefix = ""
+        full = False
+        for u in notification.update:
+            value = numeric_value(u.val)
+            if value is None:
+                continue
+            path = prefix+grpc_support.string_from_path(u.path)
+            column = columns.get(path)
+            if column is None:
+                column = Column(np, value, self.size)
+                columns[path] = column
+            full = column.append(np, timestamp, value) or full
+        if full:
+            self.flush()
+
+    def flush(self):
+        columns = [(path, column) for (path, column) in self.columns.items() if column.count]
+        if not columns:
+            return
+        self.batches += 1
+        filename = os.path.join(self.directory, 'telemetry-%s-%06d.%s' % (self.run, self.batches, self.format))
+        if self.format == 'parquet':
+            self.write_parquet(filename, columns)
+        else:
+            self.write_npz(filename, columns)
+        self.log.debug("%d columns written to %s", len(columns), filename)
+        for (path, column) in columns:
+            column.count = 0
+
+    def write_npz(self, filename, columns):
+        # paths[i] is stored as arrays t<i> (timestamps) and v<i> (values)
+        arrays = {'paths': self.np.array([path for (path, column) in columns])}
+        for (i, (path, column)) in enumerate(columns):
+            arrays['t%d' % i] = column.timestamps[:column.count]
+            arrays['v%d' % i] = column.values[:column.count]
+        self.np.savez(filename, **arrays)
+
+    def write_parquet(self, filename, columns):
+        # long format, integer and float leaves in separate nullable columns
+        import pyarrow
+        import pyarrow.parquet
+        np = self.np
+        paths = []
+        timestamps = []
+        ints = []
+        floats = []
+        for (i, (path, column)) in enumerate(columns):
+            n = column.count
+            paths.append(np.full(n, i, dtype=np.int32))
+            timestamps.append(column.timestamps[:n])
+            if column.values.dtype == np.float64:
+                ints.append(np.zeros(n, dtype=np.int64))
+                floats.append(column.values[:n])
+            else:
+                ints.append(column.values[:n])
+                floats.append(np.zeros(n, dtype=np.float64))
+        isfloat = np.concatenate([np.full(column.count, column.values.dtype == np.float64) for (path, column) in columns])
+        table = pyarrow.table({
+            'path': pyarrow.DictionaryArray.from_arrays(np.concatenate(paths), [path for (path, column) in columns]),
+            'timestamp': np.concatenate(timestamps),
+            'int_value': pyarrow.array(np.concatenate(ints), mask=isfloat),
+            'float_value': pyarrow.array(np.concatenate(floats), mask=~isfloat),
+        })
+        pyarrow.parquet.write_table(table, filename)
+
+    def close(self):
+        self.flush()
+
+# EOF
@@ -0,0 +1,249 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_export.py                                                            #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for pygnmi.py (service: export)                       #
+#    Keeps the latest numeric value of every subscribed path and serves      #
+#    them in the Prometheus text exposition format over HTTP.                #
+#                                                                            #
+#  Metric names:                                                             #
+#                                                                            #
+#    element names joined by '_', keys become labels                         #
+#      /state/port[port-id=1/1/1]/statistics/in-octets                       #
+#      gnmi_state_port_statistics_in_octets{port_id="1/1/1"}                 #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI Prometheus exporter in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_export"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import re
+import threading
+import grpc_support
+import gnmi_columnar
+import gnmi_state
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+##############################################################################
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_invalid = re.compile(r'[^a-zA-Z0-9_]')
+
+def metric_name(namespace, elems):
+    name = "_".join([namespace] + [e.name for e in elems])
+    name = _invalid.sub('_', name)
+    if name[:1].isdigit():
+        name = '_'+name
+    return name
+
+def _label_value(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def metric_labels(elems):
+    # keys of all elements, a key name repeated further down the path is
+    # qualified with its element name
+    labels = []
+    seen = set()
+    for e in elems:
+        for k in sorted(e.key):
+            label = _invalid.sub('_', k)
+            if label in seen:
+                label = _invalid.sub('_', e.name)+'_'+label
+            seen.add(label)
+            labels.append('%s="%s"' % (label, _label_value(e.key[k])))
+    if labels:
+        return "{"+",".join(labels)+"}"
+    return ""
+
+def sample_value(value):
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return value > 0 and '+Inf' or '-Inf'
+        return repr(value)
+    return str(value)
+
+
+class MetricsSink(object):
+    # Notification sink holding one series per leaf path. Ingestion only
+    # replaces the value of a known series; the metric name and labels are
+    # rendered once, when a path is seen first, and a sample line is only
+    # formatted again when its value changed.
+
+    def __init__(self, log, namespace='gnmi'):
+        self.log = log
+        self.namespace = namespace
+        # path string -> [name, 'name{labels} ', value, (value, line)]
+        self.series = {}
+        # metric name -> {path string: series}
+        self.families = {}
+        # path string of the series by element, for subtree deletes
+        self.index = gnmi_state.Node()
+        # held for adding and removing series, not for value updates
+        self.lock = threading.Lock()
+
+    def write(self, notification):
+        series = self.series
+        if notification.prefix.elem:
+            prefix = grpc_support.string_from_path(notification.prefix)
+        else:
+            prefix = ""
+        for path in notification.delete:
+            self.remove([gnmi_state.elem_key(e) for e in notification.prefix.elem] + [gnmi_state.elem_key(e) for e in path.elem])
+        for u in notification.update:
+            value = gnmi_columnar.numeric_value(u.val)
+            if value is None:
+                continue
+            key = prefix+grpc_support.string_from_path(u.path)
+            entry = series.get(key)
+            if entry is None:
+                self.add(key, notification.prefix, u.path, value)
+            else:
+                entry[2] = value
+
+    def add(self, key, prefix, path, value):
+        elems = list(prefix.elem) + list(path.elem)
+        name = metric_name(self.namespace, elems)
+        entry = [name, name+metric_labels(elems)+' ', value, None]
+        with self.lock:
+            self.series[key] = entry
+            self.families.setdefault(name, {})[key] = entry
+            node = self.index
+            for e in elems:
+                node = node.child(gnmi_state.elem_key(e))
+            node.value = key
+
+    def remove(self, keys):
+        # a deleted path removes the series below it too
+        with self.lock:
+            nodes = [self.index]
+            for k in keys:
+                node = nodes[-1].children and nodes[-1].children.get(k)
+                if not node:
+                    return
+                nodes.append(node)
+            stack = [nodes[-1]]
+            while stack:
+                node = stack.pop()
+                if node.value is not None:
+                    entry = self.series.pop(node.value)
+                    family = self.families[entry[0]]
+                    del family[node.value]
+                    if not family:
+                        del self.families[entry[0]]
+                if node.children:
+                    stack.extend(node.children.values())
+            # detach the subtree and the containers left empty
+            if not keys:
+                self.index = gnmi_state.Node()
+            for i in range(len(keys), 0, -1):
+                del nodes[i-1].children[keys[i-1]]
+                if nodes[i-1].children or nodes[i-1].value is not None:
+                    break
+
+    def render(self):
+        # The snapshot is taken under the lock, formatting runs outside of
+        # it while ingestion continues. The cached line keeps the value it
+        # shows, so a value written meanwhile is picked up next time.
+        with self.lock:
+            families = [(name, list(members.values())) for (name, members) in self.families.items()]
+        lines = []
+        for (name, entries) in sorted(families, key=lambda family: family[0]):
+            lines.append('# TYPE %s gauge' % name)
+            for entry in entries:
+                value = entry[2]
+                rendered = entry[3]
+                if rendered is None or rendered[0] != value:
+                    rendered = (value, entry[1]+sample_value(value))
+                    entry[3] = rendered
+                lines.append(rendered[1])
+        lines.append('')
+        return "\n".join(lines).encode('utf-8')
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ScrapeHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.sink.render()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        self.server.log.debug("%s %s", self.client_address[0], format % args)
+
+
+def start_server(sink, listen, log):
+    # serves /metrics from a daemon thread
+    (host, port) = listen.rsplit(':', 1)
+    server = HTTPServer((host, int(port)), ScrapeHandler)
+    server.sink = sink
+    server.log = log
+    thread = threading.Thread(target=server.serve_forever, name='export')
+    thread.daemon = True
+    thread.start()
+    log.info("Serving metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
+
+
+def export(channel, options, log, prog):
+    import gNMI_Subscribe
+
+    sink = MetricsSink(log, options.export_namespace)
+    server = start_server(sink, options.export_listen, log)
+
+    # the exported series are the output, updates are not logged as well
+    if options.output == "raw":
+        options.output = "none"
+    try:
+        return gNMI_Subscribe.subscribe(channel, options, log, prog, forward=lambda response: sink.write(response.update))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+# EOF
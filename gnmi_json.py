@@ -0,0 +1,200 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_json.py                                                              #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py and gNMI_Get.py                 #
+#    Decodes json_val/json_ietf_val payloads with the fastest JSON library   #
+#    installed (orjson, ujson, rapidjson, json). Scalars are decoded without #
+#    a parser, recently seen payloads are answered from a small cache.       #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI JSON value decoding in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_json"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import base64
+import json
+import math
+import re
+import grpc_support
+
+##############################################################################
+
+BACKENDS = ('orjson', 'ujson', 'rapidjson', 'json')
+
+backend = None
+loads = None
+dumps = None
+
+def use(name):
+    # selects the JSON library, 'auto' picks the first one installed;
+    # raises ImportError when <name> is not installed
+    global backend, loads, dumps
+    if name == 'auto':
+        for candidate in BACKENDS:
+            try:
+                use(candidate)
+                return backend
+            except ImportError:
+                pass
+    module = __import__(name)
+    backend = name
+    loads = module.loads
+    # dumps() returns compact str with every library
+    if name == 'orjson':
+        dumps = lambda v: module.dumps(v).decode('utf-8')
+    elif name == 'ujson':
+        dumps = lambda v: module.dumps(v, escape_forward_slashes=False)
+    elif name == 'json':
+        dumps = lambda v: module.dumps(v, separators=(',', ':'))
+    else:
+        dumps = module.dumps
+    _payloads.clear()
+    _encoded.clear()
+    return backend
+
+_payloads = grpc_support.LRUCache(4096)
+_encoded = grpc_support.LRUCache(4096)
+
+_constants = {b'true': True, b'false': False, b'null': None}
+
+# scalars the fast path decodes, anything else goes to the JSON library
+_integer = re.compile(br'-?(?:0|[1-9][0-9]*)')
+_number = re.compile(br'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?')
+_string = re.compile(br'"[^"\\\x00-\x1f]*"')
+
+def decode(raw):
+    # Python value of a JSON payload (bytes or str). Decoded objects and
+    # arrays are shared through the cache and must not be modified.
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    first = raw[:1]
+    if first == b'"':
+        if _string.fullmatch(raw):
+            return raw[1:-1].decode('utf-8')
+    elif first and first in b'-0123456789':
+        if _integer.fullmatch(raw):
+            return int(raw)
+        if _number.fullmatch(raw):
+            value = float(raw)
+            # out of range exponents are left to the library
+            if not math.isinf(value):
+                return value
+    elif raw in _constants:
+        return _constants[raw]
+
+    value = _payloads.get(raw, _payloads)
+    if value is _payloads:
+        value = loads(raw)
+        _payloads.put(raw, value)
+    return value
+
+_values = {
+    'string_val':    lambda v: v.string_val,
+    'ascii_val':     lambda v: v.ascii_val,
+    'int_val':       lambda v: v.int_val,
+    'uint_val':      lambda v: v.uint_val,
+    'bool_val':      lambda v: v.bool_val,
+    'float_val':     lambda v: v.float_val,
+    'json_val':      lambda v: decode(v.json_val),
+    'json_ietf_val': lambda v: decode(v.json_ietf_val),
+    'bytes_val':     lambda v: base64.b64encode(v.bytes_val).decode('ascii'),
+    'decimal_val':   lambda v: v.decimal_val.digits / 10.0**v.decimal_val.precision,
+    'leaflist_val':  lambda v: [value(e) for e in v.leaflist_val.element],
+    'any_val':       lambda v: v.any_val.type_url,
+}
+
+def value(val):
+    # Python value of a TypedValue, JSON payloads decoded
+    kind = val.WhichOneof('value')
+    if kind is None:
+        return None
+    return _values[kind](val)
+
+def encode(val):
+    # JSON text of a TypedValue; JSON payloads are re-encoded once per
+    # distinct payload, compact and on a single line. Malformed payloads are
+    # written as a JSON string of their text.
+    kind = val.WhichOneof('value')
+    if kind == 'json_val' or kind == 'json_ietf_val':
+        raw = getattr(val, kind)
+        text = _encoded.get(raw)
+        if text is None:
+            try:
+                value = decode(raw)
+            except ValueError:
+                value = raw.decode('utf-8', 'replace')
+            try:
+                text = dumps(value)
+            except (TypeError, OverflowError):
+                # beyond the library, e.g. integers over 64 bits for orjson
+                text = json.dumps(value, separators=(',', ':'))
+            _encoded.put(raw, text)
+        return text
+    if kind is None:
+        return 'null'
+    return dumps(_values[kind](val))
+
+
+class JsonlWriter(grpc_support.XpathWriter):
+    # Batched writer of one JSON record per leaf:
+    #   {"target": ..., "path": ..., "timestamp": ..., "value": ...}
+    # deleted paths are written with "delete": true instead of a value
+
+    def __init__(self, sink, target, batch=1000, delay=1.0):
+        grpc_support.XpathWriter.__init__(self, sink, batch, delay)
+        self.head = '{"target":%s,"path":' % dumps(target)
+        self.paths = grpc_support.LRUCache()
+
+    def path(self, prefix, path):
+        # JSON string of the full xpath
+        xpath = prefix+grpc_support.string_from_path(path)
+        text = self.paths.get(xpath)
+        if text is None:
+            text = dumps(xpath)
+            self.paths.put(xpath, text)
+        return text
+
+    def format(self, notification, lines):
+        if notification.prefix.elem:
+            prefix = grpc_support.string_from_path(notification.prefix)
+        else:
+            prefix = ""
+        head = self.head
+        tail = ',"timestamp":%d,' % notification.timestamp
+        for path in notification.delete:
+            lines.append(head+self.path(prefix, path)+tail+'"delete":true}\n')
+        for u in notification.update:
+            lines.append(head+self.path(prefix, u.path)+tail+'"value":'+encode(u.val)+'}\n')
+
+use('auto')
+
+# EOF
@@ -0,0 +1,266 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_match.py                                                             #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    Compiles xpath patterns into a trie and routes each update to the       #
+#    named handlers of the patterns matching its path, in time proportional  #
+#    to the path depth rather than to the number of patterns.                #
+#                                                                            #
+#  Patterns:                                                                 #
+#                                                                            #
+#    *            any single element                                         #
+#    ...          any number of elements (also none)                         #
+#    [name=*]     any key value                                              #
+#    no keys      any list entry                                             #
+#                                                                            #
+#    A pattern matches the paths below it as well, as subscriptions do.      #
+#    Fully specified keys are looked up and must match all keys of the       #
+#    element, keys with '*' values are checked one by one.                   #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI path matcher in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_match"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import itertools
+import grpc_support
+
+##############################################################################
+
+class _Keys(object):
+    # the trie edges of one element name, by key constraint
+
+    __slots__ = ('exact', 'any', 'partial')
+
+    def __init__(self):
+        # sorted ((key, value), ...) -> node
+        self.exact = {}
+        # no keys or only '*' values
+        self.any = None
+        # keys mixing '*' and values, indexed by their first fixed pair:
+        # (key, value) -> [(((key, value), ...), node)]
+        self.partial = {}
+
+
+class _Node(object):
+
+    __slots__ = ('names', 'star', 'dots', 'loop', 'handlers')
+
+    def __init__(self, loop=False):
+        self.names = {}
+        self.star = None
+        self.dots = None
+        # '...' nodes stay active for every further element
+        self.loop = loop
+        self.handlers = []
+
+
+class Matcher(object):
+
+    def __init__(self):
+        self.root = _Node()
+        self.rules = 0
+
+    def add(self, xpath, name):
+        # the pattern <xpath> routes to handler <name>
+        node = self.root
+        for e in grpc_support.path_from_string(xpath).elem:
+            if e.name == '...':
+                if node.dots is None:
+                    node.dots = _Node(loop=True)
+                node = node.dots
+                continue
+            if e.name == '*':
+                if node.star is None:
+                    node.star = _Keys()
+                keys = node.star
+            else:
+                keys = node.names.get(e.name)
+                if keys is None:
+                    keys = _Keys()
+                    node.names[e.name] = keys
+            values = [v for v in e.key.values() if v != '*']
+            if not values:
+                if keys.any is None:
+                    keys.any = _Node()
+                node = keys.any
+            elif len(values) == len(e.key):
+                constraint = tuple(sorted(e.key.items()))
+                node = keys.exact.get(constraint)
+                if node is None:
+                    node = _Node()
+                    keys.exact[constraint] = node
+            else:
+                constraint = tuple(sorted(e.key.items()))
+                fixed = [(k, v) for (k, v) in constraint if v != '*'][0]
+                candidates = keys.partial.setdefault(fixed, [])
+                for (c, child) in candidates:
+                    if c == constraint:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    candidates.append((constraint, child))
+                    node = child
+        node.handlers.append((self.rules, name))
+        self.rules += 1
+
+    def _closure(self, nodes):
+        # adds the '...' nodes reachable without consuming an element
+        states = []
+        seen = set()
+        while nodes:
+            node = nodes.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            states.append(node)
+            if node.dots is not None:
+                nodes.append(node.dots)
+        return states
+
+    def match(self, *paths):
+        # names of the handlers matching the concatenated <paths> (prefix,
+        # path, ...), in the order the rules were added
+        states = self._closure([self.root])
+        found = []
+        for node in states:
+            found.extend(node.handlers)
+        for e in itertools.chain(*[path.elem for path in paths]):
+            following = []
+            exact = None
+            for node in states:
+                if node.loop:
+                    following.append(node)
+                for keys in (node.names.get(e.name), node.star):
+                    if keys is None:
+                        continue
+                    if keys.any is not None:
+                        following.append(keys.any)
+                    if keys.exact and e.key:
+                        if exact is None:
+                            exact = tuple(sorted(e.key.items()))
+                        child = keys.exact.get(exact)
+                        if child is not None:
+                            following.append(child)
+                    if keys.partial and e.key:
+                        # only the rules fixing one of the element's values
+                        for kv in e.key.items():
+                            for (constraint, child) in keys.partial.get(kv, ()):
+                                if all(k in e.key and (v == '*' or e.key[k] == v) for (k, v) in constraint):
+                                    following.append(child)
+            if not following:
+                break
+            states = self._closure(following)
+            for node in states:
+                found.extend(node.handlers)
+        if len(found) > 1:
+            found = sorted(set(found))
+        names = []
+        for (n, name) in found:
+            if name not in names:
+                names.append(name)
+        return names
+
+
+class Router(object):
+    # Notification sink passing every update to the sinks of the handlers
+    # its path matches, as Notifications with the original timestamp and
+    # prefix. Updates matching no pattern are dropped.
+
+    def __init__(self, log):
+        self.log = log
+        self.matcher = Matcher()
+        self.sinks = {}
+        self.counts = {}
+        self.unmatched = 0
+        self.files = []
+
+    def route(self, name, xpath):
+        self.matcher.add(xpath, name)
+        self.counts.setdefault(name, 0)
+
+    def names(self):
+        return sorted(self.counts)
+
+    def output(self, directory, batch=1000, delay=1.0):
+        # xpath lines of every handler to <directory>/<name>.txt
+        import os
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        for name in self.names():
+            f = open(os.path.join(directory, name+'.txt'), 'w')
+            self.files.append(f)
+            self.sinks[name] = grpc_support.XpathWriter(f, batch, delay)
+
+    def write(self, notification):
+        import gnmi_pb2
+        routed = {}
+        prefix = notification.prefix
+        for u in notification.update:
+            names = self.matcher.match(prefix, u.path)
+            if not names:
+                self.unmatched += 1
+            for name in names:
+                routed.setdefault(name, []).append(u)
+        for (name, updates) in routed.items():
+            self.counts[name] += len(updates)
+            sink = self.sinks.get(name)
+            if sink is not None:
+                sink.write(gnmi_pb2.Notification(timestamp=notification.timestamp, prefix=prefix, update=updates))
+
+    def flush(self):
+        for sink in set(self.sinks.values()):
+            sink.flush()
+
+    def close(self):
+        for sink in set(self.sinks.values()):
+            sink.close()
+        for f in self.files:
+            f.close()
+        for name in self.names():
+            self.log.info("Match %s: %d updates", name, self.counts[name])
+        self.log.info("%d updates matched no pattern", self.unmatched)
+
+
+def read_rules(filename):
+    # '<name> <xpath>' per line, blank lines and '#' comments are ignored
+    rules = []
+    with open(filename) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                (name, xpath) = line.split(None, 1)
+                rules.append((name, xpath.strip()))
+    return rules
+
+# EOF
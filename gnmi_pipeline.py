@@ -0,0 +1,259 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_pipeline.py                                                          #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    Decouples reading the gRPC response stream from handling and output:    #
+#    a receive thread and decode, format and sink stages connected by        #
+#    bounded queues, with queue depth and stall time metrics. Stages may run #
+#    several workers and still pass their results on in order.               #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI subscribe pipeline in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_pipeline"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+##############################################################################
+
+# end of stream marker
+STOP = object()
+
+
+class BoundedQueue(object):
+    # queue.Queue recording how long producers were blocked on a full queue
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.queue = queue.Queue(size)
+        self.items = 0
+        self.maxdepth = 0
+        self.stalls = 0
+        self.stalled = 0.0
+
+    def put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            start = time.time()
+            self.queue.put(item)
+            self.stalls += 1
+            self.stalled += time.time() - start
+        self.items += 1
+        depth = self.queue.qsize()
+        if depth > self.maxdepth:
+            self.maxdepth = depth
+
+    def get(self):
+        return self.queue.get()
+
+    def metrics(self):
+        return {
+            'name': self.name,
+            'size': self.size,
+            'depth': self.queue.qsize(),
+            'max_depth': self.maxdepth,
+            'items': self.items,
+            'stalls': self.stalls,
+            'stalled_seconds': round(self.stalled, 3),
+        }
+
+
+class Receiver(object):
+    # Iterates the response stream in its own thread, so a slow consumer
+    # fills the queue instead of holding back the gRPC stream. Exceptions of
+    # the stream are raised again to the consumer, in order.
+
+    def __init__(self, responses, size, log):
+        self.responses = responses
+        self.log = log
+        self.queue = BoundedQueue('receive', size)
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name='receive')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        try:
+            for response in self.responses:
+                self.queue.put(response)
+        except Exception as err:
+            self.error = err
+        self.queue.queue.put(STOP)
+
+    def __iter__(self):
+        try:
+            while True:
+                response = self.queue.get()
+                if response is STOP:
+                    break
+                yield response
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        # stops the receive thread when the consumer gives up early
+        if self.thread.is_alive() and hasattr(self.responses, 'cancel'):
+            self.responses.cancel()
+
+
+class Stage(object):
+    # Calls <function> for every item put, from <workers> threads. Results
+    # are passed to <following> in the order the items were put, None
+    # results are dropped. close() waits until the queue is drained.
+
+    def __init__(self, name, function, size, log, workers=1, following=None):
+        self.function = function
+        self.following = following
+        self.log = log
+        self.workers = workers
+        # with several workers the queue holds slots [item, result, done] in
+        # the order put, and the work queue hands them to the workers
+        self.queue = BoundedQueue(name, size)
+        self.busy = 0.0
+        if workers > 1:
+            self.work = queue.Queue()
+            self.threads = [threading.Thread(target=self.work_slots, name='%s-%d' % (name, n)) for n in range(workers)]
+            self.threads.append(threading.Thread(target=self.pass_slots, name=name))
+        else:
+            self.work = None
+            self.threads = [threading.Thread(target=self.run, name=name)]
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+
+    def put(self, item):
+        if self.work is None:
+            self.queue.put(item)
+        else:
+            slot = [item, None, threading.Event()]
+            self.queue.put(slot)
+            self.work.put(slot)
+
+    def call(self, item):
+        start = time.time()
+        try:
+            return self.function(item)
+        except Exception as err:
+            self.log.error("%s stage: %s", self.queue.name, err)
+        finally:
+            self.busy += time.time() - start
+
+    def pass_on(self, result):
+        if self.following is not None and result is not None:
+            try:
+                self.following(result)
+            except Exception as err:
+                self.log.error("%s stage: %s", self.queue.name, err)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is STOP:
+                break
+            self.pass_on(self.call(item))
+
+    def work_slots(self):
+        while True:
+            slot = self.work.get()
+            if slot is STOP:
+                break
+            slot[1] = self.call(slot[0])
+            slot[2].set()
+
+    def pass_slots(self):
+        # hands on the results in order, waiting for slower workers
+        while True:
+            slot = self.queue.get()
+            if slot is STOP:
+                break
+            slot[2].wait()
+            self.pass_on(slot[1])
+
+    def metrics(self):
+        metrics = self.queue.metrics()
+        metrics['workers'] = self.workers
+        metrics['busy_seconds'] = round(self.busy, 3)
+        return metrics
+
+    def close(self):
+        self.queue.queue.put(STOP)
+        if self.work is not None:
+            for n in range(self.workers):
+                self.work.put(STOP)
+        for thread in self.threads:
+            thread.join()
+
+
+def log_metrics(log, level, queues):
+    for q in queues:
+        m = q.metrics()
+        if 'workers' in m:
+            busy = ", %d workers busy for %1.2f seconds" % (m['workers'], m['busy_seconds'])
+        else:
+            busy = ""
+        log.log(level, "Pipeline %s: depth %d/%d (max %d), %d items, stalled %d times for %1.2f seconds%s",
+                m['name'], m['depth'], m['size'], m['max_depth'], m['items'], m['stalls'], m['stalled_seconds'], busy)
+
+
+class Monitor(object):
+    # logs the metrics of the queues returned by <queues>() every <interval>
+    # seconds
+
+    def __init__(self, queues, interval, log, level):
+        self.queues = queues
+        self.interval = interval
+        self.log = log
+        self.level = level
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='monitor')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            log_metrics(self.log, self.level, self.queues())
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+
+# EOF
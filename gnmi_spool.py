@@ -0,0 +1,214 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_spool.py                                                             #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    On-disk telemetry spool: output is written to segments rotated by size  #
+#    or age, finished segments are compressed (gzip or zstd) by a background #
+#    thread and listed with their time range in a manifest.                  #
+#    zstd compression requires the zstandard package.                        #
+#                                                                            #
+#  Manifest:                                                                 #
+#                                                                            #
+#    manifest.jsonl in the spool directory, one JSON object per segment:     #
+#      segment, start, end (epoch seconds of the first and last write),      #
+#      bytes (uncompressed) and size (on disk)                               #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI telemetry spool in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_spool"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import json
+import os
+import shutil
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+##############################################################################
+
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+
+class Compressor(object):
+    # Compresses finished segments in order and appends them to the
+    # manifest, so writing the next segment never waits for compression.
+
+    def __init__(self, directory, method, log):
+        self.directory = directory
+        self.method = method
+        self.log = log
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name='compress')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, filename, start, end, size):
+        self.queue.put((filename, start, end, size))
+
+    def run(self):
+        while True:
+            segment = self.queue.get()
+            if segment is None:
+                break
+            try:
+                self.finish(*segment)
+            except Exception as err:
+                self.log.error("Spool segment %s: %s", segment[0], err)
+
+    def compress(self, filename):
+        # returns the name of the compressed file
+        target = filename + COMPRESSIONS[self.method]
+        with open(filename, 'rb') as src:
+            if self.method == 'gzip':
+                import gzip
+                with gzip.open(target, 'wb', 6) as dst:
+                    shutil.copyfileobj(src, dst, 1048576)
+            else:
+                import zstandard
+                with open(target, 'wb') as f:
+                    with zstandard.ZstdCompressor(level=3).stream_writer(f) as dst:
+                        shutil.copyfileobj(src, dst, 1048576)
+        os.remove(filename)
+        return target
+
+    def finish(self, filename, start, end, size):
+        if self.method != 'none':
+            filename = self.compress(filename)
+        entry = {
+            'segment': os.path.basename(filename),
+            'start': round(start, 3),
+            'end': round(end, 3),
+            'bytes': size,
+            'size': os.path.getsize(filename),
+        }
+        with open(os.path.join(self.directory, 'manifest.jsonl'), 'a') as f:
+            f.write(json.dumps(entry, sort_keys=True)+"\n")
+        self.log.debug("Spool segment %s closed, %d bytes, %d on disk", entry['segment'], size, entry['size'])
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+
+class Spool(object):
+    # Binary file object writing into rotating segments; a segment is
+    # finished when it exceeds <size> bytes or is older than <interval>
+    # seconds, checked at every write and every second by a timer thread so
+    # idle streams rotate too. Every segment starts with <header>. Rotation
+    # happens between write() calls, writers hand over whole records.
+
+    mode = 'wb'
+
+    def __init__(self, directory, log, extension, header=b'', size=268435456, interval=3600, compress='gzip'):
+        if compress not in COMPRESSIONS:
+            log.error("Unsupported spool compression "+compress)
+            quit()
+        if compress == 'zstd':
+            try:
+                import zstandard
+            except ImportError as err:
+                log.error(str(err))
+                quit()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.directory = directory
+        self.log = log
+        self.extension = extension
+        self.header = header
+        self.size = size
+        self.interval = interval
+        self.compressor = Compressor(directory, compress, log)
+        self.run = time.strftime('%Y%m%d-%H%M%S')
+        self.segments = 0
+        self.file = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.timer = threading.Thread(target=self.watch, name='spool')
+        self.timer.daemon = True
+        self.timer.start()
+
+    def open(self, now):
+        self.segments += 1
+        self.filename = os.path.join(self.directory, 'telemetry-%s-%06d.%s' % (self.run, self.segments, self.extension))
+        self.file = open(self.filename, 'wb', 1048576)
+        self.file.write(self.header)
+        self.written = len(self.header)
+        self.start = now
+        self.last = now
+
+    def rotate(self):
+        self.file.close()
+        self.file = None
+        self.compressor.submit(self.filename, self.start, self.last, self.written)
+
+    def due(self, now):
+        return self.file is not None and (self.written >= self.size or now - self.start >= self.interval)
+
+    def watch(self):
+        while not self.stopped.wait(min(self.interval, 1.0)):
+            with self.lock:
+                if self.due(time.time()):
+                    self.rotate()
+
+    def write(self, data):
+        now = time.time()
+        with self.lock:
+            if self.due(now):
+                self.rotate()
+            if self.file is None:
+                self.open(now)
+            self.file.write(data)
+            self.written += len(data)
+            self.last = now
+
+    def flush(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+
+    def close(self):
+        self.stopped.set()
+        self.timer.join()
+        with self.lock:
+            if self.file is not None:
+                self.rotate()
+        self.compressor.close()
+        self.log.info("%d spool segments written to %s", self.segments, self.directory)
+
+# EOF
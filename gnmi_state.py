@@ -0,0 +1,238 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_state.py                                                             #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    In-memory state tree kept current from Notifications, so the state of   #
+#    a device can be read from the process instead of issuing Gets.          #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI state tree in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_state"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import threading
+import grpc_support
+
+##############################################################################
+
+def elem_key(e):
+    # node key of a PathElem: (name, ((key, value), ...)) with sorted keys
+    if e.key:
+        return (e.name, tuple(sorted(e.key.items())))
+    return (e.name, ())
+
+def render_key(key):
+    (name, keys) = key
+    return name + "".join('[%s="%s"]' % kv for kv in keys)
+
+def elem_matches(pattern, key):
+    # '*' matches any element name or key value, keys missing from the
+    # pattern match any value
+    if pattern[0] != '*' and pattern[0] != key[0]:
+        return False
+    if pattern[1]:
+        values = dict(key[1])
+        for (k, v) in pattern[1]:
+            if v != '*' and values.get(k) != v:
+                return False
+    return True
+
+
+class Node(object):
+
+    __slots__ = ('children', 'value', 'timestamp')
+
+    def __init__(self):
+        self.children = None
+        self.value = None
+        self.timestamp = 0
+
+    def child(self, key):
+        if self.children is None:
+            self.children = {}
+        node = self.children.get(key)
+        if node is None:
+            node = Node()
+            self.children[key] = node
+        return node
+
+    def leaves(self):
+        n = 0
+        if self.value is not None:
+            n = 1
+        if self.children:
+            for node in self.children.values():
+                n += node.leaves()
+        return n
+
+
+class StateTree(object):
+    # Notifications are applied in arrival order, deletes before updates as
+    # for the target. Leaves store the TypedValue and the Notification
+    # timestamp. Can be used as a notification sink. Writes and reads hold
+    # the lock, so other threads may read while the subscription runs;
+    # stored TypedValues are replaced, never modified.
+
+    def __init__(self):
+        self.root = Node()
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        # number of leaves
+        return self.count
+
+    def _keys(self, prefix, path):
+        return [elem_key(e) for e in prefix.elem] + [elem_key(e) for e in path.elem]
+
+    def write(self, notification):
+        import gnmi_pb2
+        prefix = notification.prefix
+        timestamp = notification.timestamp
+        with self.lock:
+            for path in notification.delete:
+                self._delete(self._keys(prefix, path))
+            for u in notification.update:
+                node = self.root
+                for key in self._keys(prefix, u.path):
+                    node = node.child(key)
+                if node.value is None:
+                    self.count += 1
+                # detached from the response, so it can be freed
+                value = gnmi_pb2.TypedValue()
+                value.CopyFrom(u.val)
+                node.value = value
+                node.timestamp = timestamp
+
+    def delete(self, keys):
+        # removes the subtree at <keys> and the containers left empty
+        with self.lock:
+            self._delete(keys)
+
+    def _delete(self, keys):
+        if not keys:
+            self.count = 0
+            self.root = Node()
+            return
+        nodes = [self.root]
+        for key in keys[:-1]:
+            children = nodes[-1].children
+            if not children or key not in children:
+                return
+            nodes.append(children[key])
+        children = nodes[-1].children
+        if not children or keys[-1] not in children:
+            return
+        self.count -= children.pop(keys[-1]).leaves()
+        for i in range(len(nodes)-1, 0, -1):
+            if nodes[i].children or nodes[i].value is not None:
+                break
+            del nodes[i-1].children[keys[i-1]]
+
+    def query(self, path):
+        # [(xpath, Node)] of the subtrees matching <path>, a Path or an xpath
+        # string, which may use '*' for element names and key values. The
+        # nodes stay live, other threads should read leaves with items().
+        if not hasattr(path, 'elem'):
+            path = grpc_support.path_from_string(path)
+        keys = [elem_key(e) for e in path.elem]
+        with self.lock:
+            return list(self._matched(self.root, keys, []))
+
+    def _matched(self, node, keys, rendered):
+        if len(rendered) == len(keys):
+            yield ("/"+"/".join(rendered), node)
+            return
+        children = node.children
+        if not children:
+            return
+        pattern = keys[len(rendered)]
+        if pattern[0] != '*' and all(v != '*' for (k, v) in pattern[1]):
+            # fully specified element, no scan needed
+            child = children.get(pattern)
+            if child is not None:
+                for match in self._matched(child, keys, rendered+[render_key(pattern)]):
+                    yield match
+                return
+        for (k, child) in children.items():
+            if elem_matches(pattern, k):
+                for match in self._matched(child, keys, rendered+[render_key(k)]):
+                    yield match
+
+    def get(self, path):
+        # (TypedValue, timestamp) of a single leaf, None if not present
+        if not hasattr(path, 'elem'):
+            path = grpc_support.path_from_string(path)
+        with self.lock:
+            node = self.root
+            for e in path.elem:
+                if not node.children:
+                    return None
+                node = node.children.get(elem_key(e))
+                if node is None:
+                    return None
+            if node.value is None:
+                return None
+            return (node.value, node.timestamp)
+
+    def items(self, path="/"):
+        # [(xpath, TypedValue, timestamp)] of every leaf below <path>, a
+        # consistent snapshot
+        if not hasattr(path, 'elem'):
+            path = grpc_support.path_from_string(path)
+        keys = [elem_key(e) for e in path.elem]
+        leaves = []
+        with self.lock:
+            for (xpath, node) in self._matched(self.root, keys, []):
+                stack = [(xpath.rstrip('/'), node)]
+                while stack:
+                    (prefix, node) = stack.pop()
+                    if node.value is not None:
+                        leaves.append((prefix or "/", node.value, node.timestamp))
+                    if node.children:
+                        for (k, child) in node.children.items():
+                            stack.append((prefix+"/"+render_key(k), child))
+        return leaves
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def dump(tree, f):
+    # current state as '<xpath> <value>' lines
+    for (xpath, value, timestamp) in sorted(tree.items(), key=lambda item: item[0]):
+        f.write("%s %s\n" % (xpath, grpc_support.string_from_value(value)))
+
+# EOF
@@ -0,0 +1,250 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_stats.py                                                             #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    Per-subscription-path statistics: update and message rates, bytes per   #
+#    message, notification inter-arrival times and device-to-collector lag   #
+#    (from Notification.timestamp), reported every interval.                 #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI subscription statistics in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_stats"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import json
+import threading
+import time
+import grpc_support
+import gnmi_state
+
+##############################################################################
+
+class Histogram(object):
+    # log2 buckets of microseconds, bucket i holds values below 2**i us
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, secs):
+        us = int(secs * 1000000)
+        if us < 0:
+            us = 0
+        self.buckets[min(us.bit_length(), self.BUCKETS-1)] += 1
+        self.count += 1
+        self.total += secs
+        if secs > self.max:
+            self.max = secs
+
+    def percentile(self, p):
+        # upper bound of the bucket holding the p-th percentile, in seconds
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100.0
+        seen = 0
+        for (i, n) in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min((1 << i) / 1000000.0, self.max)
+        return self.max
+
+    def report(self):
+        # milliseconds
+        if not self.count:
+            return None
+        return {
+            'count': self.count,
+            'mean': round(self.total/self.count*1000, 3),
+            'p50': round(self.percentile(50)*1000, 3),
+            'p99': round(self.percentile(99)*1000, 3),
+            'max': round(self.max*1000, 3),
+            'buckets_us': dict(('<%d' % (1 << i), n) for (i, n) in enumerate(self.buckets) if n),
+        }
+
+
+class PathStats(object):
+    # counters of one subscription path, reset every interval except the
+    # totals
+
+    __slots__ = ('path', 'msgs', 'upds', 'bytes', 'total_msgs', 'total_upds', 'last', 'interarrival', 'lag')
+
+    def __init__(self, path):
+        self.path = path
+        self.total_msgs = 0
+        self.total_upds = 0
+        self.last = None
+        self.reset()
+
+    def reset(self):
+        self.msgs = 0
+        self.upds = 0
+        self.bytes = 0
+        self.interarrival = Histogram()
+        self.lag = Histogram()
+
+
+class SubscriptionStats(object):
+    # Attributes every update and delete to the subscription path it matches
+    # and reports per path every <interval> seconds, to the log and
+    # optionally as one JSON object per path and interval to <filename>.
+    # Subscription paths are relative to <prefix>, as in the
+    # SubscriptionList. A Notification spanning several subscription paths
+    # counts as a message for each of them, its bytes are shared in
+    # proportion to the updates and deletes each one got.
+
+    def __init__(self, xpaths, log, interval=10, filename=None, verbose=True, prefix=''):
+        self.log = log
+        self.interval = interval
+        self.verbose = verbose
+        if prefix:
+            base = [gnmi_state.elem_key(e) for e in grpc_support.path_from_string(prefix).elem]
+        else:
+            base = []
+        self.paths = []
+        for xpath in xpaths:
+            path = grpc_support.path_from_string(xpath)
+            self.paths.append((base + [gnmi_state.elem_key(e) for e in path.elem], PathStats(grpc_support.string_from_path(path))))
+        self.other = PathStats('other')
+        # update path string -> PathStats
+        self.matched = grpc_support.LRUCache()
+        if filename:
+            self.file = open(filename, 'a')
+        else:
+            self.file = None
+        self.lock = threading.Lock()
+        self.start = time.time()
+        self.last = self.start
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='stats')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def lookup(self, prefix, prefixstring, path):
+        # first subscription path covering the update, cached per path
+        key = prefixstring + grpc_support.string_from_path(path)
+        stats = self.matched.get(key)
+        if stats is None:
+            keys = [gnmi_state.elem_key(e) for e in prefix.elem] + [gnmi_state.elem_key(e) for e in path.elem]
+            stats = self.other
+            for (pattern, candidate) in self.paths:
+                if len(pattern) <= len(keys) and all(gnmi_state.elem_matches(p, k) for (p, k) in zip(pattern, keys)):
+                    stats = candidate
+                    break
+            self.matched.put(key, stats)
+        return stats
+
+    def update(self, response, now=None):
+        # response: a SubscribeResponse carrying a Notification
+        if now is None:
+            now = time.time()
+        notification = response.update
+        entries = len(notification.update) + len(notification.delete)
+        if not entries:
+            return
+        prefix = notification.prefix
+        if prefix.elem:
+            prefixstring = grpc_support.string_from_path(prefix)
+        else:
+            prefixstring = ""
+        # PathStats -> [updates, deletes]
+        counts = {}
+        for u in notification.update:
+            counts.setdefault(self.lookup(prefix, prefixstring, u.path), [0, 0])[0] += 1
+        for path in notification.delete:
+            counts.setdefault(self.lookup(prefix, prefixstring, path), [0, 0])[1] += 1
+        size = response.ByteSize()
+        with self.lock:
+            for (stats, (upds, deletes)) in counts.items():
+                stats.msgs += 1
+                stats.upds += upds
+                stats.bytes += size * (upds + deletes) / float(entries)
+                if stats.last is not None:
+                    stats.interarrival.add(now - stats.last)
+                stats.last = now
+                if notification.timestamp:
+                    stats.lag.add(now - notification.timestamp/1000000000.0)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.emit()
+
+    def emit(self):
+        now = time.time()
+        with self.lock:
+            secs = now - self.last
+            self.last = now
+            reports = []
+            for stats in [stats for (pattern, stats) in self.paths] + [self.other]:
+                if stats is self.other and not stats.msgs:
+                    continue
+                stats.total_msgs += stats.msgs
+                stats.total_upds += stats.upds
+                reports.append({
+                    'time': round(now, 3),
+                    'path': stats.path,
+                    'seconds': round(secs, 3),
+                    'msgs': stats.msgs,
+                    'upds': stats.upds,
+                    'total_msgs': stats.total_msgs,
+                    'total_upds': stats.total_upds,
+                    'msg_rate': round(stats.msgs/secs, 1) if secs > 0 else 0.0,
+                    'upd_rate': round(stats.upds/secs, 1) if secs > 0 else 0.0,
+                    'bytes_per_msg': int(stats.bytes/stats.msgs) if stats.msgs else 0,
+                    'interarrival_ms': stats.interarrival.report(),
+                    'lag_ms': stats.lag.report(),
+                })
+                stats.reset()
+
+        for report in reports:
+            if self.verbose:
+                lag = report['lag_ms'] or {'p50': 0.0, 'max': 0.0}
+                self.log.info("%s: %5.0f upd/sec, %5.0f msg/sec, %d bytes/msg, lag p50 %1.1f max %1.1f ms",
+                              report['path'], report['upd_rate'], report['msg_rate'], report['bytes_per_msg'], lag['p50'], lag['max'])
+            if self.file:
+                self.file.write(json.dumps(report, sort_keys=True)+"\n")
+        if self.file:
+            self.file.flush()
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+        self.emit()
+        if self.file:
+            self.file.close()
+
+# EOF
@@ -0,0 +1,173 @@
+#!/usr/bin/python
+
+##############################################################################
+#                                                                            #
+#  gnmi_wire.py                                                              #
+#                                                                            #
+#  History Change Log:                                                       #
+#                                                                            #
+#    1.0  [JGC]  2026/10/18    first version                                 #
+#                                                                            #
+#  Objective:                                                                #
+#                                                                            #
+#    Supporting module for gNMI_Subscribe.py                                 #
+#    Reads the kind of a serialized SubscribeResponse and the prefix and     #
+#    paths of its Notification straight from the protobuf wire format, so    #
+#    responses can be archived or filtered without being decoded.            #
+#                                                                            #
+#  License:                                                                  #
+#                                                                            #
+#    Licensed under the MIT license                                          #
+#    See LICENSE.md delivered with this project for more information.        #
+#                                                                            #
+#  Author:                                                                   #
+#                                                                            #
+#    James Cumming [JGC]                                                     #
+#    mail:  james.cumming(at)nokia.com                                       #
+#                                                                            #
+##############################################################################
+
+"""
+gNMI wire format peeking in Python Version 1.0
+Copyright (C) 2018 Nokia. All Rights Reserved.
+"""
+
+__title__   = "gnmi_wire"
+__version__ = "1.0"
+__status__  = "dev"
+__author__  = "James Cumming"
+__date__    = "2026 October 18th"
+
+##############################################################################
+
+import grpc_support
+import gnmi_state
+
+##############################################################################
+
+# SubscribeResponse kinds, by field number
+UPDATE = 1
+SYNC = 3
+ERROR = 4
+
+def _varint(data, pos):
+    # (value, position after it)
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if b < 0x80:
+            return (result, pos)
+        shift += 7
+
+def _fields(data, pos, end):
+    # (field number, wire type, value start, value end) of a message; the
+    # value of varint and fixed fields is not read
+    while pos < end:
+        (key, pos) = _varint(data, pos)
+        wiretype = key & 7
+        start = pos
+        if wiretype == 0:
+            while data[pos] & 0x80:
+                pos += 1
+            pos += 1
+        elif wiretype == 2:
+            (length, start) = _varint(data, pos)
+            pos = start + length
+        elif wiretype == 1:
+            pos += 8
+        elif wiretype == 5:
+            pos += 4
+        else:
+            raise ValueError("unsupported wire type %d" % wiretype)
+        yield (key >> 3, wiretype, start, pos)
+
+def peek(data):
+    # (kind, prefix, updates, deletes, alias) of a serialized
+    # SubscribeResponse. For updates prefix is the serialized Notification
+    # prefix (b'' when absent), updates and deletes the serialized paths of
+    # its updates and deletes in order; alias is True for alias definitions.
+    for (field, wiretype, start, end) in _fields(data, 0, len(data)):
+        if field != UPDATE:
+            return (field, b'', [], [], False)
+        prefix = b''
+        updates = []
+        deletes = []
+        alias = False
+        for (nfield, nwiretype, nstart, nend) in _fields(data, start, end):
+            if nfield == 2:
+                prefix = data[nstart:nend]
+            elif nfield == 3:
+                alias = True
+            elif nfield == 4:
+                # Update: path=1
+                path = b''
+                for (ufield, uwiretype, ustart, uend) in _fields(data, nstart, nend):
+                    if ufield == 1:
+                        path = data[ustart:uend]
+                        break
+                updates.append(path)
+            elif nfield == 5:
+                deletes.append(data[nstart:nend])
+        return (UPDATE, prefix, updates, deletes, alias)
+    return (None, b'', [], [], False)
+
+
+class PathFilter(object):
+    # Passes updates and deletes whose path, joined with the notification
+    # prefix, is compatible with one of the filter paths: element by element
+    # matching ('*' allowed) as far as both paths go. Aliased prefixes are
+    # resolved through <aliases>, an AliasTable; unknown aliases pass.
+
+    def __init__(self, xpaths, aliases=None):
+        self.patterns = []
+        for path in grpc_support.paths_from_strings(xpaths):
+            self.patterns.append([gnmi_state.elem_key(e) for e in path.elem])
+        self.aliases = aliases
+        self.version = None
+        self.results = grpc_support.LRUCache()
+
+    def select(self, prefix, updates, deletes):
+        # True when all updates and deletes pass, False when none does,
+        # otherwise the lists of pass flags of the updates and the deletes
+        if not updates and not deletes:
+            return self.match(prefix, b'')
+        passed = [self.match(prefix, path) for path in updates]
+        deleted = [self.match(prefix, path) for path in deletes]
+        if all(passed) and all(deleted):
+            return True
+        if not any(passed) and not any(deleted):
+            return False
+        return (passed, deleted)
+
+    def match(self, prefix, path):
+        # results depend on the aliases, they are dropped when one changes
+        if self.aliases is not None and self.aliases.version != self.version:
+            self.version = self.aliases.version
+            self.results = grpc_support.LRUCache()
+        key = (prefix, path)
+        result = self.results.get(key)
+        if result is None:
+            result = self.evaluate(prefix, path)
+            self.results.put(key, result)
+        return result
+
+    def evaluate(self, prefix, path):
+        import gnmi_pb2
+        elems = list(gnmi_pb2.Path.FromString(prefix).elem)
+        if len(elems) == 1 and self.aliases is not None:
+            resolved = self.aliases.get(elems[0].name)
+            if resolved is not None:
+                elems = list(resolved.elem)
+        if elems and elems[0].name.startswith('#'):
+            return True
+        elems += gnmi_pb2.Path.FromString(path).elem
+        keys = [gnmi_state.elem_key(e) for e in elems]
+        for pattern in self.patterns:
+            if all(gnmi_state.elem_matches(p, k) for (p, k) in zip(pattern, keys)):
+                return True
+        return False
+
+# EOF
@@ -51,98 +51,492 @@ import argparse
 import re
 import sys
 import os
+import io
+import collections
+import threading
+import base64
 import logging
 import time
 import gnmi_pb2
 
 ##############################################################################
 
-def create_channel(options,log):
+def channel_options(options):
+    # keepalive and HTTP/2 ping settings, only applied when --keepalive is set
+    opts = []
+    if getattr(options, 'keepalive', None):
+        opts.append(('grpc.keepalive_time_ms', options.keepalive*1000))
+        opts.append(('grpc.keepalive_timeout_ms', options.keepalive_timeout*1000))
+        opts.append(('grpc.keepalive_permit_without_calls', 1))
+        opts.append(('grpc.http2.max_pings_without_data', 0))
+        opts.append(('grpc.http2.min_time_between_pings_ms', options.keepalive*1000))
+    return opts
+
+def create_channel(options,log,server=None,aio=False):
     try:
         import grpc
+        if aio:
+            import grpc.aio
     except ImportError as err:
         log.error(str(err))
         quit()
 
+    # asyncio channels (grpc.aio) share the constructor signatures of the
+    # blocking ones, so the same credential setup serves both
+    module = grpc.aio if aio else grpc
+
+    if server is None:
+        server = options.server
+
+    opts = channel_options(options)
+
     if options.tls or options.cert:
-        log.debug("Create SSL Channel")
+        log.debug("Create SSL Channel to "+server)
         if options.cert:
-            cred = grpc.ssl_channel_credentials(root_certificates=open(options.cert).read())
-            opts = []
+            cred = grpc.ssl_channel_credentials(root_certificates=open(options.cert, 'rb').read())
             if options.altName:
                 opts.append(('grpc.ssl_target_name_override', options.altName,))
             if options.noHostCheck:
                 log.error('Disable server name verification against TLS cert is not yet supported!')
                 # TODO: Clarify how to setup gRPC with SSLContext using check_hostname:=False
 
-            channel = grpc.secure_channel(options.server, cred, opts)
+            channel = module.secure_channel(server, cred, opts)
             return channel
         else:
             log.error('Disable cert validation against root certificate (InsecureSkipVerify) is not yet supported!')
             # TODO: Clarify how to setup gRPC with SSLContext using verify_mode:=CERT_NONE
 
             cred = grpc.ssl_channel_credentials(root_certificates=None, private_key=None, certificate_chain=None)
-            channel = grpc.secure_channel(options.server, cred)
+            channel = module.secure_channel(server, cred, opts)
             return channel
 
     else:
-        log.info("Create insecure channel to "+options.server+" Username: "+options.username+" Password: "+options.password)
-        channel = grpc.insecure_channel(options.server)
+        log.info("Create insecure channel to "+server+" Username: "+options.username+" Password: "+options.password)
+        channel = module.insecure_channel(server, opts)
         return channel
 
-def list_from_path(path='/'):
-    if path:
-        if path[0]=='/':
-            if path[-1]=='/':
-                return re.split('''/(?=(?:[^\[\]]|\[[^\[\]]+\])*$)''', path)[1:-1]
+
+class ChannelManager(object):
+    # Caches one channel per target and credential set, so the capabilities,
+    # get, set and subscribe services of a process share the TCP/TLS
+    # connection. Connectivity state changes are tracked and logged.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.channels = {}
+        self.states = {}
+
+    def key(self, options, server):
+        return (server, bool(options.tls), options.cert, options.altName, options.username, options.password,
+                getattr(options, 'keepalive', None), getattr(options, 'keepalive_timeout', None))
+
+    def get(self, options, log, server=None, wait=None):
+        # blocking (non-asyncio) channel, when wait is given it only returns
+        # once the channel is READY; raises IOError after <wait> seconds
+        import grpc
+
+        if server is None:
+            server = options.server
+        key = self.key(options, server)
+        with self.lock:
+            channel = self.channels.get(key)
+            if channel is None:
+                channel = create_channel(options, log, server=server)
+                self.channels[key] = channel
+                self.states[key] = None
+                channel.subscribe(lambda state, key=key: self.changed(key, state, log), try_to_connect=wait is not None)
             else:
-                return re.split('''/(?=(?:[^\[\]]|\[[^\[\]]+\])*$)''', path)[1:]
-        else:
-            if path[-1]=='/':
-                return re.split('''/(?=(?:[^\[\]]|\[[^\[\]]+\])*$)''', path)[:-1]
+                log.debug("Reusing channel to "+server)
+
+        if wait is not None:
+            try:
+                grpc.channel_ready_future(channel).result(timeout=wait)
+            except grpc.FutureTimeoutError:
+                state = self.state(options, server)
+                self.close(options, server)
+                raise IOError("Channel to %s not ready within %d seconds (%s)" % (server, wait, state))
+        return channel
+
+    def changed(self, key, state, log):
+        self.states[key] = state
+        log.debug("Channel to %s: %s", key[0], state)
+
+    def state(self, options, server=None):
+        if server is None:
+            server = options.server
+        return self.states.get(self.key(options, server))
+
+    def close(self, options, server=None):
+        if server is None:
+            server = options.server
+        with self.lock:
+            channel = self.channels.pop(self.key(options, server), None)
+            self.states.pop(self.key(options, server), None)
+        if channel is not None:
+            channel.close()
+
+    def close_all(self):
+        with self.lock:
+            channels = list(self.channels.values())
+            self.channels.clear()
+            self.states.clear()
+        for channel in channels:
+            channel.close()
+
+channels = ChannelManager()
+
+class LRUCache(object):
+    # bounded mapping, least recently used entries are evicted first
+
+    def __init__(self, size=65536):
+        self.size = size
+        self.data = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        try:
+            value = self.data.pop(key)
+        except KeyError:
+            return default
+        self.data[key] = value
+        return value
+
+    def put(self, key, value):
+        self.data.pop(key, None)
+        self.data[key] = value
+        if len(self.data) > self.size:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+
+
+def tokenize_path(path='/'):
+    # Single pass over an xpath string, returns a tuple of elements in the
+    # form (name, ((key, value), ...)) with keys sorted. Element separators
+    # inside [...] are ignored, a backslash escapes the next character so key
+    # values may contain ']', '=' or '/'.
+    elems = []
+    name = []
+    keys = []
+    key = None
+    value = None
+    i = 0
+    n = len(path)
+    while i < n:
+        c = path[i]
+        if c == '\\' and i+1 < n:
+            i += 1
+            c = path[i]
+            if value is not None:
+                value.append(c)
+            elif key is not None:
+                key.append(c)
+            else:
+                name.append(c)
+        elif value is not None:
+            if c == ']':
+                keys.append(("".join(key), "".join(value)))
+                key = None
+                value = None
             else:
-                return re.split('''/(?=(?:[^\[\]]|\[[^\[\]]+\])*$)''', path)
-    return []
+                value.append(c)
+        elif key is not None:
+            if c == '=':
+                value = []
+            elif c == ']':
+                raise ValueError("missing '=' in key of path "+path)
+            else:
+                key.append(c)
+        elif c == '[':
+            key = []
+        elif c == ']':
+            raise ValueError("unexpected ']' in path "+path)
+        elif c == '/':
+            if name or keys:
+                elems.append(("".join(name), tuple(sorted(keys))))
+            name = []
+            keys = []
+        else:
+            name.append(c)
+        i += 1
 
+    if key is not None:
+        raise ValueError("unterminated '[' in path "+path)
+    if name or keys:
+        elems.append(("".join(name), tuple(sorted(keys))))
+    return tuple(elems)
 
-def path_from_string(path='/'):
-    mypath = []
 
-    for e in list_from_path(path):
-        eName = e.split("[", 1)[0]
-        eKeys = re.findall('\[(.*?)\]', e)
-        dKeys = dict(x.split('=', 1) for x in eKeys)
-        mypath.append(gnmi_pb2.PathElem(name=eName, key=dKeys))
+_parsed_paths = LRUCache()
+
+def parse_path(path='/'):
+    # cached tokenize_path(), the result is immutable and safe to share
+    parsed = _parsed_paths.get(path)
+    if parsed is None:
+        parsed = tokenize_path(path)
+        _parsed_paths.put(path, parsed)
+    return parsed
+
+
+def _escape_key(value):
+    return value.replace('\\', '\\\\').replace(']', '\\]')
+
 
+def list_from_path(path='/'):
+    mylist = []
+    for (eName, eKeys) in parse_path(path):
+        mylist.append(eName+"".join("["+k+"="+_escape_key(v)+"]" for (k, v) in eKeys))
+    return mylist
+
+
+def path_from_parsed(parsed):
+    mypath = []
+    for (eName, eKeys) in parsed:
+        mypath.append(gnmi_pb2.PathElem(name=eName, key=dict(eKeys)))
     return gnmi_pb2.Path(elem=mypath)
 
-def string_from_path(path):
+
+def parsed_from_path(path):
+    # immutable (name, sorted keys) form of a Path message, see parse_path()
+    return tuple((e.name, tuple(sorted(e.key.items()))) for e in path.elem)
+
+
+_built_paths = LRUCache()
+
+def path_from_string(path='/'):
+    # Path messages are mutable, hand out a copy of the cached one
+    cached = _built_paths.get(path)
+    if cached is None:
+        cached = path_from_parsed(parse_path(path))
+        _built_paths.put(path, cached)
+    mypath = gnmi_pb2.Path()
+    mypath.CopyFrom(cached)
+    return mypath
+
+
+def paths_from_strings(paths):
+    # bulk conversion for large subscription or get lists
+    return [path_from_string(path) for path in paths]
+
+def render_path(path):
     pathString = []
     for e in path.elem:
-      if e:
-        pathString.append(e.name)
-        for eKey in e.key:
-          pathString.append("["+eKey+"="+"\""+e.key[eKey]+"\""+"]")
-    returnString = "/"+"/".join(pathString)
+        eString = e.name
+        for eKey in sorted(e.key):
+            eString += "["+eKey+"="+"\""+e.key[eKey]+"\""+"]"
+        pathString.append(eString)
+    return "/"+"/".join(pathString)
+
+
+_rendered_paths = LRUCache()
+
+def string_from_path(path):
+    # SAMPLE subscriptions repeat the same paths every interval, so the
+    # rendering is cached against the serialized Path
+    if not path.elem:
+        return "/"
+    raw = path.SerializeToString()
+    returnString = _rendered_paths.get(raw)
+    if returnString is None:
+        returnString = render_path(path)
+        _rendered_paths.put(raw, returnString)
     return returnString
 
+class AliasTable(object):
+    # gNMI path aliases, alias name (starting with '#') to prefix Path.
+    # Client-defined aliases are added with define(), target-defined ones
+    # are learned from notifications carrying an alias and a prefix.
+
+    def __init__(self):
+        self.aliases = {}
+        # changes with every definition, for caches of resolved paths
+        self.version = 0
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def get(self, alias):
+        return self.aliases.get(alias)
+
+    def define(self, alias, path):
+        self.aliases[alias] = path
+        self.version += 1
+
+    def learn(self, notification):
+        # returns True for pure alias definitions, which carry no data
+        if notification.alias and notification.prefix.elem:
+            self.aliases[notification.alias] = notification.prefix
+            self.version += 1
+            return not (notification.update or notification.delete)
+        return False
+
+    def resolve(self, notification):
+        # replaces an aliased prefix by the full path, in place
+        prefix = notification.prefix
+        if len(prefix.elem) == 1:
+            path = self.aliases.get(prefix.elem[0].name)
+            if path is not None:
+                prefix.CopyFrom(path)
+        return notification
+
+
+def _decimal_string(d):
+    digits = str(d.digits)
+    if d.precision:
+        digits = digits.rjust(d.precision+1, "0")
+        return digits[:-d.precision]+"."+digits[-d.precision:]
+    return digits
+
+def _text_string(v):
+    if isinstance(v, bytes):
+        return v.decode('utf-8', 'replace')
+    return v
+
+_value_formats = {
+    'string_val':    lambda v: v.string_val,
+    'ascii_val':     lambda v: v.ascii_val,
+    'int_val':       lambda v: str(v.int_val),
+    'uint_val':      lambda v: str(v.uint_val),
+    'bool_val':      lambda v: "true" if v.bool_val else "false",
+    'float_val':     lambda v: repr(v.float_val),
+    'json_val':      lambda v: _text_string(v.json_val),
+    'json_ietf_val': lambda v: _text_string(v.json_ietf_val),
+    'bytes_val':     lambda v: _text_string(base64.b64encode(v.bytes_val)),
+    'decimal_val':   lambda v: _decimal_string(v.decimal_val),
+    'leaflist_val':  lambda v: "["+", ".join(string_from_value(e) for e in v.leaflist_val.element)+"]",
+    'any_val':       lambda v: v.any_val.type_url,
+}
+
+def string_from_value(val):
+    # render a TypedValue by dispatching on its oneof, without text_format
+    kind = val.WhichOneof('value')
+    if kind is None:
+        return ""
+    return _value_formats[kind](val)
+
+def string_from_update(u):
+    if u.HasField('val'):
+        return string_from_value(u.val)
+    # deprecated gNMI 0.3 Value message
+    return _text_string(u.value.value)
+
 def xpath_output(output):
     newOutput = []
+    if output.prefix.elem:
+        prefix = string_from_path(output.prefix)
+    else:
+        prefix = ""
     for u in output.update:
-        if output.prefix.elem:
-            tmpOutput = ""
-            tmpOutput += string_from_path(output.prefix)
-            newOutput.append(tmpOutput)
-        tmpOutput = ""
-        tmpOutput += string_from_path(u.path)
-        tmpOutput += ": "
-        tmpOutput += u.val.json_val
-        newOutput.append(tmpOutput)
+        newOutput.append(prefix)
+        newOutput.append(string_from_path(u.path))
+        newOutput.append(": ")
+        newOutput.append(string_from_update(u))
         newOutput.append("\n")
     output = "".join(newOutput)
     return output
 
 
+class _Flusher(object):
+    # one thread writing out the batched writers whose oldest line is due
+
+    def __init__(self, tick=0.1):
+        self.tick = tick
+        self.writers = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add(self, writer):
+        with self.lock:
+            self.writers.add(writer)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='flusher')
+                self.thread.daemon = True
+                self.thread.start()
+
+    def remove(self, writer):
+        with self.lock:
+            self.writers.discard(writer)
+
+    def run(self):
+        while True:
+            time.sleep(self.tick)
+            with self.lock:
+                writers = list(self.writers)
+            now = time.time()
+            for writer in writers:
+                writer.expire(now)
+
+_flusher = _Flusher()
+
+
+class XpathWriter(object):
+    # Streams "path: value" lines into the output file. Lines are collected
+    # and written in batches, a batch is written when it holds <batch> lines
+    # or, by the flusher thread, when the oldest line is older than <delay>
+    # seconds.
+
+    def __init__(self, sink, batch=1000, delay=1.0):
+        self.sink = sink
+        self.binary = 'b' in getattr(sink, 'mode', '')
+        self.batch = batch
+        self.delay = delay
+        self.lines = []
+        self.since = 0
+        self.lock = threading.Lock()
+        _flusher.add(self)
+
+    def format(self, notification, lines):
+        if notification.prefix.elem:
+            prefix = string_from_path(notification.prefix)
+        else:
+            prefix = ""
+        for u in notification.update:
+            lines.append(prefix+string_from_path(u.path)+": "+string_from_update(u)+"\n")
+
+    def write(self, notification):
+        with self.lock:
+            lines = self.lines
+            if not lines:
+                self.since = time.time()
+            self.format(notification, lines)
+            if len(lines) >= self.batch:
+                self._flush()
+
+    def extend(self, lines):
+        # lines already produced by format(), e.g. in a pipeline stage
+        with self.lock:
+            if not self.lines:
+                self.since = time.time()
+            self.lines.extend(lines)
+            if len(self.lines) >= self.batch:
+                self._flush()
+
+    def expire(self, now):
+        with self.lock:
+            if self.lines and now-self.since >= self.delay:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.lines:
+            data = "".join(self.lines)
+            self.lines = []
+            if self.binary:
+                data = data.encode('utf-8')
+            self.sink.write(data)
+        self.sink.flush()
+
+    def close(self):
+        _flusher.remove(self)
+        self.flush()
+
+
 ##############################################################################
 
 def setup_log(options,prog):
@@ -182,7 +576,11 @@ def setup_log(options,prog):
           os.environ["GRPC_VERBOSITY"] = "DEBUG"
 
         timeformat = '%y/%m/%d %H:%M:%S'
-        loghandler = logging.StreamHandler(options.logfile)
+        logstream = options.logfile
+        if sys.version_info[0] >= 3 and 'b' in getattr(logstream, 'mode', ''):
+            # logfile is opened binary, python3 logging writes str
+            logstream = io.TextIOWrapper(logstream, write_through=True)
+        loghandler = logging.StreamHandler(logstream)
         loghandler.setFormatter(logging.Formatter(logformat, timeformat))
 
     log = logging.getLogger(prog)
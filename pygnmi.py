@@ -16,6 +16,11 @@
 #                                                                            #
 #    - gNMI Capabilities                                                     #
 #    - gNMI Subscribe (Based on Nokia SR OS release 16 feature-set)          #
+#    - concurrent subscribe to many targets (asyncio collector)              #
+#    - collector targets sharded over worker processes                       #
+#    - Prometheus exporter for subscribed numeric leaves                     #
+#    - gNMI Get                                                              #
+#    - gNMI Set (batched, pipelined to many targets)                         #
 #    - secure and insecure mode                                              #
 #    - multiple subscriptions paths                                          #
 #                                                                            #
@@ -23,8 +28,6 @@
 #                                                                            #
 #    - Disable server name verification against TLS cert (opt: noHostCheck)  #
 #    - Disable cert validation against root certificate (InsecureSkipVerify) #
-#    - gNMI Get                                                              #
-#    - gNMI Set                                                              #
 #                                                                            #
 #  License:                                                                  #
 #                                                                            #
@@ -55,6 +58,7 @@ __date__    = "2018 June 26th"
 ##############################################################################
 
 import argparse
+import json
 import re
 import sys
 import os
@@ -63,7 +67,7 @@ import grpc_support
 
 ##############################################################################
 
-def get_options():
+def get_options(argv=None):
     prog = os.path.splitext(os.path.basename(sys.argv[0]))[0]
 
     parser = argparse.ArgumentParser()
@@ -81,16 +85,50 @@ def get_options():
     group.add_argument('--ciphers', help='override environment "GRPC_SSL_CIPHER_SUITES"')
     group.add_argument('--altName', help='subjectAltName/CN override for server host validation')
     group.add_argument('--noHostCheck',  action='store_true', help='disable server host validation')
+    group.add_argument('--keepalive', type=int, help='keepalive ping interval in seconds (default: none)')
+    group.add_argument('--keepalive_timeout', default=20, type=int, help='keepalive ping timeout in seconds (default: 20)')
+    group.add_argument('--wait', type=int, help='wait up to <wait> seconds for the channel to be ready (default: none)')
 
     group = parser.add_argument_group()
     group.add_argument('--logfile', metavar='<filename>', type=argparse.FileType('wb', 0), default='-', help='Specify the logfile (default: <stdout>)')
     group.add_argument('--stats', action='store_true', help='collect stats')
+    group.add_argument('--stats_file', metavar='<filename>', help='append per-subscription-path statistics as JSON lines every --report seconds')
     group.add_argument('--logstash', action='store_true', help='Change subscription output format to be supported by logstash')
-    group.add_argument('--output', default='raw', help='Output format [raw, xpath]')
+    group.add_argument('--output', default='raw', help='Output format [raw, xpath, jsonl (subscribe), json (get), none]')
+    group.add_argument('--outfile', metavar='<filename>', type=argparse.FileType('wb'), help='buffered file for xpath and jsonl output (default: logfile)')
+    group.add_argument('--flush_interval', default=1.0, type=float, help='maximum time xpath and jsonl output is held back (default: 1s)')
+    group.add_argument('--json_backend', default='auto', help='JSON library decoding json values [auto, orjson, ujson, rapidjson, json] (default: auto)')
+    group.add_argument('--batch', default=1000, type=int, help='xpath and jsonl output lines per write (default: 1000)')
+    group.add_argument('--record', metavar='<filename>', help='capture raw subscribe responses to file')
+    group.add_argument('--replay', metavar='<filename>', help='subscribe from a capture file instead of the server')
+    group.add_argument('--pace', action='store_true', help='replay with the original timing (default: as fast as possible)')
+    group.add_argument('--columnar', metavar='<directory>', help='buffer numeric leaves in NumPy columns, written to <directory>')
+    group.add_argument('--columnar_format', default='npz', help='columnar file format [npz, parquet] (default: npz)')
+    group.add_argument('--columnar_size', default=1024, type=int, help='samples per path before a batch is written (default: 1024)')
+    group.add_argument('--match', metavar='<name>=<xpath>', action='append', help='route updates matching <xpath> (*, ..., [k=*]) to handler <name>, others are dropped (repeatable)')
+    group.add_argument('--match_file', metavar='<filename>', help="match rules, one '<name> <xpath>' per line")
+    group.add_argument('--match_dir', metavar='<directory>', help='write the updates of each handler to <directory>/<name>.txt (default: logfile)')
+    group.add_argument('--lazy', action='store_true', help='receive serialized responses, decode updates only when needed')
+    group.add_argument('--filter', metavar='<xpath>', action='append', help='drop notifications outside <xpath> before decoding, implies --lazy (repeatable)')
+    group.add_argument('--pipeline', action='store_true', help='read the stream in its own thread, decode, format and output in stages (bounded queues)')
+    group.add_argument('--queue_size', default=10000, type=int, help='pipeline queue size in messages, per stage (default: 10000)')
+    group.add_argument('--decode_workers', default=1, type=int, help='pipeline threads decoding responses (default: 1)')
+    group.add_argument('--format_workers', default=1, type=int, help='pipeline threads formatting xpath and jsonl output (default: 1)')
+    group.add_argument('--spool', metavar='<directory>', help='write to rotating, compressed segments in <directory>')
+    group.add_argument('--spool_format', default='capture', help='spool content [capture, jsonl, xpath] (default: capture)')
+    group.add_argument('--spool_size', default=256, type=int, help='spool segment size in MB (default: 256)')
+    group.add_argument('--spool_interval', default=3600, type=int, help='spool segment age in seconds (default: 3600)')
+    group.add_argument('--spool_compress', default='gzip', help='spool compression [gzip, zstd, none] (default: gzip)')
+    group.add_argument('--state', metavar='<filename>', help='keep a state tree of the subscription, written to <filename> at the end')
 
 
     group = parser.add_argument_group()
-    group.add_argument('--service', default='capabilities', help='[capabilities, get, set, subscribe]')
+    group.add_argument('--service', default='capabilities', help='[capabilities, get, set, subscribe, collect, export]')
+    group.add_argument('--targets', metavar='<filename>', help='file with one server/port per line (service: collect, set)')
+    group.add_argument('--workers', default=1, type=int, help='worker processes the targets are spread over (service: collect, default: 1)')
+    group.add_argument('--report', default=10, type=int, help='rate and statistics report interval (default: 10s)')
+    group.add_argument('--export_listen', default='localhost:9273', metavar='<host:port>', help='metrics endpoint (service: export, default: localhost:9273)')
+    group.add_argument('--export_namespace', default='gnmi', help='metric name prefix (service: export, default: gnmi)')
 
     group = parser.add_argument_group()
     group.add_argument('--interval', default=10, type=int, help='sample interval (default: 10s)')
@@ -100,16 +138,39 @@ def get_options():
     group.add_argument('--suppress', action='store_true', help='suppress redundant')
     group.add_argument('--submode', default=2, type=int, help='subscription mode [TARGET_DEFINED, ON_CHANGE, SAMPLE]')
     group.add_argument('--mode', default=0, type=int, help='[STREAM, ONCE, POLL]')
+    group.add_argument('--poll_interval', type=float, help='seconds between polls in POLL mode (default: --interval)')
+    group.add_argument('--polls', default=0, type=int, help='number of polls to send, 0 for unlimited (default: 0)')
     group.add_argument('--encoding', default=0, type=int, help='[JSON, BYTES, PROTO, ASCII, JSON_IETF]')
     group.add_argument('--qos', default=0, type=int, help='[JSON, BYTES, PROTO, ASCII, JSON_IETF]')
-    group.add_argument('--use_alias',  action='store_true', help='use alias')
+    group.add_argument('--use_alias',  action='store_true', help='allow target-defined aliases')
+    group.add_argument('--alias', action='append', metavar='#<name>=<xpath>', help='client-defined alias, may be repeated')
+    group.add_argument('--resubscribe', action='store_true', help='re-establish the subscription when the stream breaks')
+    group.add_argument('--backoff', default=1.0, type=float, help='initial resubscribe backoff in seconds (default: 1)')
+    group.add_argument('--backoff_max', default=60.0, type=float, help='maximum resubscribe backoff in seconds (default: 60)')
     group.add_argument('--prefix', default='', help='gRPC path prefix (default: none)')
+    group.add_argument('--chunk', default=0, type=int, help='paths per GetRequest (default: all in one)')
+    group.add_argument('--parallel', default=4, type=int, help='concurrent GetRequests or SetRequests (default: 4)')
+    group.add_argument('--setfile', metavar='<filename>', help='set operations, one per line: delete|replace|update <xpath> [<json>]')
+    group.add_argument('--set_size', default=1048576, type=int, help='maximum SetRequest size in bytes (default: 1048576)')
     group.add_argument('xpaths', nargs=argparse.REMAINDER, help='path(s) to subscriber (default: /)')
-    options = parser.parse_args()
+    options = parser.parse_args(argv)
 
     if len(options.xpaths)==0:
         options.xpaths=['/']
 
+    if options.filter:
+        options.lazy = True
+
+    if options.parallel < 1:
+        parser.error('--parallel must be at least 1')
+    if options.decode_workers < 1 or options.format_workers < 1:
+        parser.error('--decode_workers and --format_workers must be at least 1')
+
+    if options.spool and options.spool_format not in ('capture', 'jsonl', 'xpath'):
+        parser.error('unknown spool format '+options.spool_format)
+    if options.spool and options.spool_format == 'capture' and options.record:
+        parser.error('--record and --spool with capture format are exclusive')
+
     if options.ciphers:
         os.environ["GRPC_SSL_CIPHER_SUITES"] = options.ciphers
     
@@ -121,7 +182,24 @@ if __name__ == '__main__':
 
     log = grpc_support.setup_log(options,prog)
 
-    channel = grpc_support.create_channel(options,log)
+    if options.json_backend != 'auto':
+        try:
+            import gnmi_json
+            gnmi_json.use(options.json_backend)
+        except ImportError as err:
+            log.error(str(err))
+            quit()
+
+    if options.service == "collect":
+        # the collector creates its own channels, in its worker processes
+        # after fork with --workers
+        channel = None
+    else:
+        try:
+            channel = grpc_support.channels.get(options,log,wait=options.wait)
+        except IOError as err:
+            log.error(str(err))
+            sys.exit(1)
 
     if options.service == "capabilities":
         try:
@@ -139,16 +217,46 @@ if __name__ == '__main__':
             log.error(str(err))
             quit()
 
+    if options.service == "export":
+        try:
+            import gnmi_export
+            output = gnmi_export.export(channel, options, log, prog)
+        except Exception as err:
+            log.error(str(err))
+            quit()
+
+    if options.service == "collect":
+        try:
+            import gNMI_Collect
+            output = gNMI_Collect.collect(options, log, prog)
+        except Exception as err:
+            log.error(str(err))
+            quit()
+
+    if options.service == "set":
+        try:
+            import gNMI_Set
+            output = gNMI_Set.set_paths(channel, options, log, prog)
+        except Exception as err:
+            log.error(str(err))
+            quit()
+
     if options.service == "get":
         try:
             import gNMI_Get
             output = gNMI_Get.get(channel, options, log, prog)
             if options.output == "xpath":
+                writer = grpc_support.XpathWriter(options.outfile or options.logfile, options.batch)
                 for n in output.notification:
-                    output = grpc_support.xpath_output(n)
+                    writer.write(n)
+                writer.close()
+                output = None
+            elif options.output == "json":
+                output = json.dumps(gNMI_Get.json_output(output), indent=2)
         except Exception as err:
             log.error(str(err))
             quit()
 
-    print output
+    if output is not None:
+        print(output)
 